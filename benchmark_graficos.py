@@ -0,0 +1,109 @@
+# Importação das Bibliotecas Necessárias
+
+import time
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from models import CalculosProjecao # Importação da classe com as funções que fazem os cálculos financeiros e de projeção
+from interface import PlotagemGrafico, PlotagemGraficoPDF # Importação das classes de plotagem (redução de pontos e gráfico do PDF)
+
+
+
+# Horizontes (em anos) comparados no benchmark
+HORIZONTES_BENCHMARK = (10, 30, 100)
+
+# Quantidade de repetições por horizonte (o tempo reportado é a mediana)
+REPETICOES_BENCHMARK = 15
+
+# Séries de valores plotadas (mesmos nomes, cores e estilos do gráfico do PDF)
+SERIES_BENCHMARK = (
+    ("Valor Nominal com Aporte", 'patrimonio_mensal', '#1F77B4', '--'),
+    ("Valor Real com Aporte", 'patrimonio_mensal_real', '#FF7F0E', '-'),
+    ("Valor Nominal sem Aporte", 'patrimonio_mensal_sem_aporte', '#000000', '--'),
+    ("Valor Real sem Aporte", 'patrimonio_mensal_sem_aporte_real', '#FF0000', '-'),
+    )
+
+
+
+def renderizar_arrays(resultado): # Função que renderiza as séries direto dos arrays NumPy com ax.plot, reduzidas à largura da área de plotagem (caminho atual dos gráficos)
+    fig = Figure(figsize=(16, 10))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    largura = int(ax.bbox.width)
+    for nome, atributo, cor, estilo in SERIES_BENCHMARK:
+        serie = getattr(resultado, atributo)
+        indices = PlotagemGrafico.indices_reduzidos(serie, largura)
+        ax.plot(resultado.meses[indices], serie[indices], label=nome, color=cor, linestyle=estilo, linewidth=3.2)
+    canvas.draw()
+
+
+def renderizar_seaborn(resultado, pd, sns): # Função que renderiza as séries pelo caminho anterior (DataFrame + sns.lineplot por série), usada apenas como referência
+    fig = Figure(figsize=(16, 10))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    df_resultados = pd.DataFrame({'Meses': resultado.meses, **{nome: getattr(resultado, atributo) for nome, atributo, _, _ in SERIES_BENCHMARK}})
+    for nome, _, cor, estilo in SERIES_BENCHMARK:
+        sns.lineplot(x='Meses', y=nome, data=df_resultados, ax=ax, label=nome, color=cor, linestyle=estilo, linewidth=3.2, legend=False)
+    canvas.draw()
+
+
+def medir(funcao, *args): # Função que retorna a mediana (em milissegundos) do tempo de REPETICOES_BENCHMARK execuções
+    tempos = []
+    for _ in range(REPETICOES_BENCHMARK):
+        inicio = time.perf_counter()
+        funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos)) * 1000
+
+
+def verificar_reducao(): # Função que imprime a quantidade de pontos plotados por série no gráfico da janela e no do PDF, e falha se um horizonte longo não for reduzido
+    largura_janela = int(Figure(figsize=(8, 4)).add_subplot().bbox.width) # Área de plotagem padrão do gráfico da janela
+    falhas = []
+
+    print(f"{'Horizonte':>10} {'Pontos':>8} {'Janela':>8} {'PDF':>8}")
+    for anos in HORIZONTES_BENCHMARK:
+        resultado = CalculosProjecao.projecao_completa(10000, 0.008, 0.004, [(1000, anos * 12)], anos * 12)
+        if resultado is None:
+            continue
+
+        pontos_janela = len(PlotagemGrafico.indices_reduzidos(resultado.patrimonio_mensal, largura_janela))
+        fig, ax = PlotagemGraficoPDF.criar_grafico_pdf(resultado)
+        pontos_pdf = max(len(linha.get_xdata()) for linha in ax.lines)
+        print(f"{anos:>8} a {len(resultado.meses):>8} {pontos_janela:>8} {pontos_pdf:>8}")
+
+        if anos >= 100 and (pontos_janela >= len(resultado.meses) or pontos_pdf >= len(resultado.meses)):
+            falhas.append(anos)
+
+    if falhas:
+        raise SystemExit(f"Séries não reduzidas nos horizontes: {falhas}")
+    print()
+
+
+def executar_benchmark(): # Função principal que imprime os tempos de renderização de cada caminho por horizonte
+    try:
+        import pandas as pd
+        import seaborn as sns
+    except ImportError:
+        pd = sns = None
+        print("seaborn/pandas não instalados: apenas o caminho direto por arrays será medido")
+
+    print(f"{'Horizonte':>10} {'Pontos':>8} {'Arrays (ms)':>12} {'Seaborn (ms)':>13} {'Ganho':>7}")
+    for anos in HORIZONTES_BENCHMARK:
+        resultado = CalculosProjecao.projecao_completa(10000, 0.008, 0.004, [(1000, anos * 12)], anos * 12)
+        if resultado is None:
+            continue
+
+        tempo_arrays = medir(renderizar_arrays, resultado)
+        if sns is None:
+            print(f"{anos:>8} a {len(resultado.meses):>8} {tempo_arrays:>12.1f} {'-':>13} {'-':>7}")
+            continue
+
+        tempo_seaborn = medir(renderizar_seaborn, resultado, pd, sns)
+        print(f"{anos:>8} a {len(resultado.meses):>8} {tempo_arrays:>12.1f} {tempo_seaborn:>13.1f} {tempo_seaborn / tempo_arrays:>6.1f}x")
+
+
+
+if __name__ == "__main__":
+    verificar_reducao()
+    executar_benchmark()
@@ -4,14 +4,14 @@ import os
 import sys
 import re
 import warnings
+import threading
+import queue
+import itertools
 from datetime import datetime
-import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-import mplcursors
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.ticker import FuncFormatter
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MultipleLocator
 
 import customtkinter as ctk
 from tkinter import messagebox
@@ -25,7 +25,23 @@ from reportlab.lib.units import inch
 from reportlab.graphics.shapes import Drawing, Rect
 from reportlab.lib.colors import Color
 
-from models import CalculosProjecao # Importação da classe com as funções que fazem os cálculos financeiros e de projeção
+from models import CalculosProjecao, CalculosProjecaoLote # Importação das classes com as funções que fazem os cálculos financeiros e de projeção (cenário único e grade de cenários)
+
+
+
+# Quantidade máxima de linhas (taxas) e colunas (prazos) da tabela de sensibilidade no PDF (grades maiores são amostradas em intervalos regulares)
+MAX_LINHAS_TABELA_SENSIBILIDADE = 15
+MAX_COLUNAS_TABELA_SENSIBILIDADE = 6
+
+# Resolução (DPI) da imagem do gráfico exportada para o PDF
+DPI_GRAFICO_PDF = 200
+
+# Tamanho máximo (em pontos) da imagem do gráfico inserida no PDF: a largura final da imagem define quantos pontos das séries são plotados
+LARGURA_MAXIMA_GRAFICO_PDF = 500 # Aproximadamente 6.94 polegadas
+ALTURA_MAXIMA_GRAFICO_PDF = 300 # Aproximadamente 4.17 polegadas
+
+# Intervalo (em milissegundos) entre as verificações dos resultados das tarefas executadas em segundo plano
+INTERVALO_VERIFICACAO_TAREFAS_MS = 50
 
 
 
@@ -57,9 +73,16 @@ class Interface: # Classe com as configurações da janela de interface gráfica
         self.duracao_entries = []
         self.valores_aportes = []
         self.duracoes_aportes = []
+        self.eixos_sensibilidade = None # Eixos da análise de sensibilidade (taxas anuais, prazos em anos e aportes); a grade é recalculada com o capital e a inflação de cada projeção e de cada relatório
+        self.sensibilidade = None # Grade exibida no mapa de calor (calculada a partir de eixos_sensibilidade)
+        self.indice_aporte_sensibilidade = 0 # Nível de aporte da grade exibido no mapa de calor
+        self.grafico = None # Gráfico persistente da janela (criado no primeiro cálculo e atualizado nos seguintes)
 
         self.configurar_janela()
 
+        # Executor das tarefas pesadas (cálculo da projeção e exportação do PDF) fora da thread da janela
+        self.executor = ExecutorTarefas(self.app, self.atualizar_ocupado)
+
         self.app.grid_rowconfigure(0, weight=1)
         self.app.grid_columnconfigure(0, weight=1)
 
@@ -165,6 +188,33 @@ class Interface: # Classe com as configurações da janela de interface gráfica
         self.button_export_pdf = ctk.CTkButton(master=self.frame_inputs, text="Exportar PDF", command=self.export_pdf)
         self.button_export_pdf.grid(row=3, column=3, padx=10, pady=7, sticky='w')
 
+        # Botão para abrir a análise de sensibilidade (grade de taxas x prazos x aportes)
+        self.button_sensibilidade = ctk.CTkButton(master=self.frame_inputs, text="Análise de Sensibilidade", command=self.abrir_popup_sensibilidade)
+        self.button_sensibilidade.grid(row=4, column=3, padx=10, pady=7, sticky='w')
+
+        # Indicador de processamento (exibido apenas enquanto há tarefas em segundo plano)
+        self.barra_ocupado = ctk.CTkProgressBar(master=self.frame_inputs, mode='indeterminate', width=150)
+        self.barra_ocupado.grid(row=5, column=3, padx=10, pady=7, sticky='w')
+        self.barra_ocupado.grid_remove()
+
+
+    def atualizar_ocupado(self, ocupado): # Função que exibe / oculta o indicador de processamento e bloqueia a exportação enquanto um PDF está sendo gerado
+        if ocupado:
+            self.barra_ocupado.grid()
+            self.barra_ocupado.start()
+        else:
+            self.barra_ocupado.stop()
+            self.barra_ocupado.grid_remove()
+
+        self.button_export_pdf.configure(state='disabled' if self.executor.ocupado('pdf') else 'normal')
+
+
+    def falhar_tarefa(self, erro): # Função que exibe (na thread da janela) o erro de uma tarefa executada em segundo plano
+        if isinstance(erro, ValueError):
+            messagebox.showerror("Erro de Entrada", str(erro))
+        else:
+            messagebox.showerror("Erro", f"Ocorreu um erro inesperado: {str(erro)}")
+
 
     def abrir_popup(self): # Função que cria uma janela pop-up para coleta dos inputs de aportes por período (prazo e valores)
         try:
@@ -277,12 +327,138 @@ class Interface: # Classe com as configurações da janela de interface gráfica
         self.duracoes_aportes.clear()
         self.periodos_entries.clear()
         self.duracao_entries.clear()
+        self.eixos_sensibilidade = None
+        self.sensibilidade = None
+        self.executor.cancelar('projecao') # Um cálculo ainda pendente não deve redesenhar os resultados limpos
+
+        if self.grafico is not None: # Libera as figuras do gráfico antes de destruir os widgets
+            self.grafico.liberar()
+            self.grafico = None
 
         for widget in self.frame_resultados.winfo_children():
             widget.destroy()
 
 
+    @staticmethod
+    def ler_valores_grade(texto, moeda=False): # Função para converter o texto de um eixo da grade em valores: lista separada por ';' e/ou intervalos 'início:fim:passo' (ex.: "6; 8; 10:14:0.5")
+        # Taxas e prazos são lidos como nos campos principais ('.' decimal); apenas os valores em reais (moeda=True) aceitam o formato "1.000,50"
+        valores = []
+        for item in texto.split(';'):
+            item = item.strip()
+            if moeda:
+                item = item.replace(".", "").replace(",", ".")
+            if not item:
+                continue
+            try:
+                partes = [float(parte) for parte in item.split(':')]
+            except ValueError:
+                raise ValueError(f"Valor inválido na grade: '{item}' (use '.' como separador decimal)") from None
+
+            if len(partes) == 3:
+                inicio, fim, passo = partes
+                if passo <= 0:
+                    raise ValueError("O passo do intervalo deve ser maior que zero")
+                valores.extend(np.arange(inicio, fim + passo / 2, passo))
+            elif len(partes) == 1:
+                valores.append(partes[0])
+            else:
+                raise ValueError(f"Intervalo inválido na grade: '{item}' (use o formato início:fim:passo)")
+
+        if not valores:
+            raise ValueError("Informe ao menos um valor para cada eixo da grade")
+        return np.array(valores, dtype=np.float64)
+
+
+    def abrir_popup_sensibilidade(self): # Função que cria uma janela pop-up para coleta dos eixos da grade de sensibilidade (taxas, prazos e aportes)
+        self.popup_sensibilidade = ctk.CTkToplevel(self.app)
+        self.popup_sensibilidade.title("Análise de Sensibilidade")
+        self.popup_sensibilidade.geometry("700x300")
+        self.popup_sensibilidade.grab_set()
+
+        campos = [
+            ("Taxas de Juros (% a.a.):", "8; 10; 12"),
+            ("Prazos (Anos):", "10:30:5"),
+            ("Aportes Mensais (R$):", "0; 1000; 2000")
+        ]
+
+        self.entries_sensibilidade = []
+        for i, (texto, exemplo) in enumerate(campos):
+            ctk.CTkLabel(master=self.popup_sensibilidade, text=texto, font=("Arial", 13)).grid(row=i, column=0, padx=10, pady=10, sticky='w')
+            entry = ctk.CTkEntry(master=self.popup_sensibilidade, width=350, placeholder_text=exemplo)
+            entry.grid(row=i, column=1, padx=10, pady=10, sticky='w')
+            self.entries_sensibilidade.append(entry)
+
+        ctk.CTkLabel(master=self.popup_sensibilidade, text="Separe os valores por ';' ou use intervalos no formato início:fim:passo (taxas e prazos com '.' decimal)", font=("Arial", 11)).grid(row=3, column=0, columnspan=2, padx=10, pady=5)
+
+        btn_calcular = ctk.CTkButton(master=self.popup_sensibilidade, text="Calcular Grade", command=self.calcular_sensibilidade)
+        btn_calcular.grid(row=4, column=0, columnspan=2, pady=10)
+
+
+    def calcular_sensibilidade(self): # Função para calcular a grade de sensibilidade (valores finais nominais e reais) e exibir o mapa de calor na janela da interface
+        try:
+            capital_str = self.entry_capital.get().replace(".", "").replace(",", ".")
+            capital_inicial = int(float(capital_str))
+            if capital_inicial < 0:
+                raise ValueError("O capital inicial não pode ser negativo")
+
+            taxa_inflacao = float(self.entry_inflacao.get()) / 100
+            if taxa_inflacao < 0:
+                raise ValueError("A taxa de inflação não pode ser negativa")
+
+            if self.combo_inflacao.get() == 'Anual':
+                taxa_inflacao = (1 + taxa_inflacao) ** (1 / 12) - 1
+
+            texto_taxas, texto_prazos, texto_aportes = (entry.get() for entry in self.entries_sensibilidade)
+            taxas_anuais = Interface.ler_valores_grade(texto_taxas) / 100
+            prazos_anos = Interface.ler_valores_grade(texto_prazos)
+            aportes = Interface.ler_valores_grade(texto_aportes, moeda=True)
+
+            if not np.allclose(prazos_anos, np.rint(prazos_anos)): # Prazos fracionários não são truncados: os rótulos da grade mostrariam um prazo diferente do informado
+                raise ValueError("Os prazos devem ser números inteiros de anos")
+            prazos_anos = np.rint(prazos_anos).astype(np.int64)
+
+            if np.any(taxas_anuais < 0):
+                raise ValueError("As taxas de juros não podem ser negativas")
+            if np.any(prazos_anos <= 0):
+                raise ValueError("Os prazos devem ser maiores que zero")
+            if np.any(aportes < 0):
+                raise ValueError("Os aportes não podem ser negativos")
+
+            # Apenas os eixos são guardados: a grade exibida e a do PDF são sempre calculadas com o capital e a inflação vigentes
+            eixos = (taxas_anuais, prazos_anos, aportes)
+            self.sensibilidade = Interface.executar_sensibilidade(capital_inicial, taxa_inflacao, eixos)
+            self.eixos_sensibilidade = eixos
+            self.indice_aporte_sensibilidade = 0
+            self.popup_sensibilidade.destroy()
+
+            self.exibir_sensibilidade()
+
+        except ValueError as e:
+            messagebox.showerror("Erro de Entrada", str(e))
+
+        except Exception as e:
+            messagebox.showerror("Erro", f"Ocorreu um erro inesperado: {str(e)}")
+
+
+    def exibir_sensibilidade(self): # Função para exibir o mapa de calor da grade de sensibilidade abaixo da projeção, com a seleção do nível de aporte
+        opcoes = [f"R$ {aporte:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".") for aporte in self.sensibilidade['Aportes Mensais']]
+
+        def selecionar_aporte(opcao): # Redesenha o mapa de calor para o nível de aporte escolhido
+            self.indice_aporte_sensibilidade = opcoes.index(opcao)
+            self.obter_grafico().plotar_sensibilidade(self.sensibilidade, self.indice_aporte_sensibilidade)
+
+        ctk.CTkLabel(master=self.frame_resultados, text="Aporte Mensal da Grade:", font=("Arial", 13, "bold")).grid(row=1, column=1, padx=10, pady=(10, 0), sticky='nw')
+        self.combo_aporte_sensibilidade = ctk.CTkComboBox(master=self.frame_resultados, values=opcoes, width=150, command=selecionar_aporte)
+        self.combo_aporte_sensibilidade.grid(row=1, column=1, padx=10, pady=(40, 10), sticky='nw')
+        self.combo_aporte_sensibilidade.set(opcoes[self.indice_aporte_sensibilidade])
+
+        self.obter_grafico().plotar_sensibilidade(self.sensibilidade, self.indice_aporte_sensibilidade)
+
+
     def export_pdf(self): # Função para calcular a projeção (para inserção no relatório em PDF)
+        if self.executor.ocupado('pdf'): # Ignora cliques repetidos enquanto o relatório anterior ainda está sendo gerado
+            return
+
         try:
             capital_str = self.entry_capital.get().replace(".", "").replace(",", ".")
             capital_inicial = int(float(capital_str))
@@ -307,10 +483,7 @@ class Interface: # Classe com as configurações da janela de interface gráfica
             if self.combo_inflacao.get() == 'Anual':
                 taxa_inflacao = (1 + taxa_inflacao) ** (1 / 12) - 1
 
-            taxa_juros_real = ((1 + taxa_juros) / (1 + taxa_inflacao)) - 1 
-
             aportes_por_periodo = []
-            total_aportes = 0
 
             for i in range(self.num_periodos):
                 aporte_str = self.valores_aportes[i].replace(".", "").replace(",", ".")
@@ -324,34 +497,9 @@ class Interface: # Classe com as configurações da janela de interface gráfica
                 
                 duracao_meses = duracao_anos * 12
                 aportes_por_periodo.append((aporte, duracao_meses))
-                total_aportes += aporte * duracao_meses
 
             prazo_meses = prazo_anos * 12
 
-
-            # CHAMADAS DAS FUNÇÕES PARA O CÁLCULO E COLETA DOS DADOS PARA GERAR O RELATÓRIO EM PDF COM OS RESULTADOS
-
-            # VALOR FUTURO COM APORTES (NOMINAL)
-            valor_futuro_final, patrimonio_mensal = CalculosProjecao.valor_futuro_ant(capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses) 
-
-            # VALOR FUTURO SEM APORTES (NOMINAL)
-            valor_futuro_sem_aporte_final, patrimonio_mensal_sem_aporte = CalculosProjecao.valor_futuro_sem_aportes(capital_inicial, taxa_juros, prazo_meses) 
-
-            # VALOR FUTURO COM APORTES (REAL)
-            valor_futuro_final_real, patrimonio_mensal_real = CalculosProjecao.valor_futuro_ant(capital_inicial, taxa_juros_real, aportes_por_periodo, prazo_meses)
-
-            # VALOR FUTURO SEM APORTES (NOMINAL)
-            valor_futuro_sem_aporte_final_real, patrimonio_mensal_sem_aporte_real = CalculosProjecao.valor_futuro_sem_aportes(capital_inicial, taxa_juros_real, prazo_meses)
-
-            # RENDIMENTOS JUROS
-            rendimento_juros = CalculosProjecao.rendimento_juros(valor_futuro_final, capital_inicial, total_aportes)
-                
-            # RENDA PERPÉTUA ou VITALÍCIA em TERMOS REAIS
-            renda_perpetua = CalculosProjecao.renda_perpetua(valor_futuro_final_real, taxa_juros_real)
-
-            # Chamada da função para calcular o valor TOTAL DE APORTES
-            valor_total_aportes = CalculosProjecao.total_aportes(aportes_por_periodo)
-
             # Abre um caixa de input para a COLETA DA SIGLA OU NOME DO RELATÓRIO
             adicionar_sigla = ctk.CTkInputDialog(text='Insira a sigla ou nome do cliente:', title='Sigla do Cliente').get_input() 
 
@@ -359,11 +507,11 @@ class Interface: # Classe com as configurações da janela de interface gráfica
                 messagebox.showwarning(title="Atenção: Sigla não inserida", message="O relatório será gerado sem uma sigla", icon='info')
                 adicionar_sigla = ""
 
-            # Chamada do método que EXPORTA O ARQUIVO PDF
-            ExportarPDF.gerar_pdf(capital_inicial, prazo_anos, taxa_juros, valor_futuro_final, valor_futuro_sem_aporte_final, rendimento_juros, patrimonio_mensal, 
-                                  patrimonio_mensal_real, patrimonio_mensal_sem_aporte, prazo_meses, aportes_por_periodo, renda_perpetua, adicionar_sigla, 
-                                  valor_futuro_final_real, taxa_juros_real, taxa_inflacao,  valor_total_aportes, valor_futuro_sem_aporte_final_real, 
-                                  patrimonio_mensal_sem_aporte_real)
+            # CÁLCULO DA PROJEÇÃO E EXPORTAÇÃO DO ARQUIVO PDF EM SEGUNDO PLANO (a tabela de sensibilidade mostra a mesma fatia de aporte do mapa de calor, recalculada com os dados do relatório)
+            parametros = (capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses)
+            eixos, indice_aporte = self.eixos_sensibilidade, self.indice_aporte_sensibilidade
+            self.executor.enviar('pdf', lambda: Interface.executar_exportacao(parametros, prazo_anos, adicionar_sigla, eixos, indice_aporte),
+                                 lambda nome_arquivo: messagebox.showinfo("Sucesso", f"Relatório gerado com sucesso: {nome_arquivo}", icon='info'), self.falhar_tarefa)
 
         except ValueError as e:
             messagebox.showerror("Erro de Entrada", str(e))
@@ -397,10 +545,7 @@ class Interface: # Classe com as configurações da janela de interface gráfica
             if self.combo_inflacao.get() == 'Anual':
                 taxa_inflacao = (1 + taxa_inflacao) ** (1 / 12) - 1
 
-            taxa_juros_real = ((1 + taxa_juros) / (1 + taxa_inflacao)) - 1 
-
             aportes_por_periodo = []
-            total_aportes = 0
             total_duracao_aportes = 0
 
             for i in range(self.num_periodos):
@@ -415,7 +560,6 @@ class Interface: # Classe com as configurações da janela de interface gráfica
                 
                 duracao_meses = duracao_anos * 12 
                 aportes_por_periodo.append((aporte, duracao_meses))
-                total_aportes += aporte * duracao_meses
                 total_duracao_aportes += duracao_meses
 
             prazo_meses = prazo_anos * 12
@@ -424,71 +568,87 @@ class Interface: # Classe com as configurações da janela de interface gráfica
                 raise ValueError("A soma dos períodos de aportes excede o prazo total da projeção")
 
 
-            # Chamada da função para calcular o VALOR FUTURO COM APORTES considerando TAXA DE JUROS NOMINAL
-            valor_futuro_final, patrimonio_mensal = CalculosProjecao.valor_futuro_ant(
-                capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses)
+            # Chamada da função que calcula em uma ÚNICA PASSAGEM as curvas NOMINAIS e REAIS (com e sem aportes) e os totais da projeção, em segundo plano (um novo clique substitui o cálculo ainda pendente)
+            parametros = (capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses)
+            self.executor.enviar('projecao', lambda: Interface.executar_projecao(*parametros), self.concluir_projecao, self.falhar_tarefa)
 
-            # Chamada da função para calcular o VALOR FUTURO SEM APORTES considerando TAXA DE JUROS NOMINAL
-            valor_futuro_sem_aporte_final, patrimonio_mensal_sem_aporte = CalculosProjecao.valor_futuro_sem_aportes(
-                capital_inicial, taxa_juros, prazo_meses)
+        except ValueError as e:
+            messagebox.showerror("Erro de Entrada", str(e))
 
-            # Chamada da função para calcular o VALOR FUTURO COM APORTES considerando TAXA DE JUROS REAL
-            valor_futuro_final_real, patrimonio_mensal_real = CalculosProjecao.valor_futuro_ant(
-                capital_inicial, taxa_juros_real, aportes_por_periodo, prazo_meses)
-            
-            # Chamada da função para calcular o VALOR FUTURO SEM APORTES considernado TAXA DE JUROS REAL
-            valor_futuro_sem_aporte_final_real, patrimonio_mensal_sem_aporte_real = CalculosProjecao.valor_futuro_sem_aportes(
-                capital_inicial, taxa_juros_real, prazo_meses) 
+        except Exception as e:
+            messagebox.showerror("Erro", f"Ocorreu um erro inesperado: {str(e)}")
 
-            # Chamada da função para calcular o valor dos RENDIMENTOS (JUROS)
-            rendimento_juros = CalculosProjecao.rendimento_juros(valor_futuro_final, capital_inicial, total_aportes) 
 
-            # Chamada da função para calcular o valor da RENDA PERPETUA ou VITALÍCIA em TERMOS REAIS
-            renda_perpetua = CalculosProjecao.renda_perpetua(valor_futuro_final_real, taxa_juros_real)
+    @staticmethod
+    def executar_projecao(capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses): # Função executada em segundo plano que calcula a projeção (erro de entrada se não for possível calcular)
+        resultado = CalculosProjecao.projecao_completa(capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses)
+        if resultado is None:
+            raise ValueError("Não foi possível calcular a projeção com os valores informados")
+        return resultado
 
-            # Chamada da função para calcular o valor TOTAL DE APORTES
-            valor_total_aportes = CalculosProjecao.total_aportes(aportes_por_periodo)
-            
-            # Chamada da função para fazer o display dos resultados na janela de interface
-            self.exibir_resultados(valor_futuro_final, valor_futuro_sem_aporte_final, rendimento_juros, renda_perpetua, patrimonio_mensal, 
-                                   patrimonio_mensal_sem_aporte, patrimonio_mensal_real, prazo_meses, valor_futuro_final_real, valor_total_aportes, 
-                                   valor_futuro_sem_aporte_final_real, patrimonio_mensal_sem_aporte_real)
 
-            # Chamada da função para plotar o gráfico da projeção na janela de interface
-            PlotagemGrafico.plotar_grafico(self.frame_resultados, patrimonio_mensal, patrimonio_mensal_sem_aporte, patrimonio_mensal_real, prazo_meses, 
-                                           patrimonio_mensal_sem_aporte_real)
+    @staticmethod
+    def executar_sensibilidade(capital_inicial, taxa_inflacao, eixos): # Função que calcula a grade de sensibilidade dos eixos (taxas anuais, prazos em anos, aportes) com o capital e a inflação mensal informados (pode rodar em segundo plano)
+        taxas_anuais, prazos_anos, aportes = eixos
 
-        except ValueError as e:
-            messagebox.showerror("Erro de Entrada", str(e))
+        # Chamada da função que calcula TODA A GRADE em uma única chamada vetorizada (taxas mensais equivalentes)
+        sensibilidade = CalculosProjecaoLote.grade_sensibilidade(capital_inicial, (1 + taxas_anuais) ** (1 / 12) - 1, prazos_anos * 12, aportes, taxa_inflacao)
+        if sensibilidade is None:
+            raise ValueError("Não foi possível calcular a grade de sensibilidade com os valores informados")
 
-        except Exception as e:
-            messagebox.showerror("Erro", f"Ocorreu um erro inesperado: {str(e)}")
+        sensibilidade['Taxas Anuais'] = taxas_anuais
+        sensibilidade['Prazos (Anos)'] = prazos_anos
+        return sensibilidade
 
 
-    # Função para plotagem do gráfico e criação / exibição do frame de resultados do projeção (campos ao lado direito do gráfico)
-    def exibir_resultados(self, valor_futuro_final, valor_futuro_sem_aporte_final, rendimento_juros, renda_perpetua, patrimonio_mensal, patrimonio_mensal_sem_aporte, 
-                      patrimonio_mensal_real, prazo_meses, valor_futuro_final_real, valor_total_aportes, valor_futuro_sem_aporte_final_real, patrimonio_mensal_sem_aporte_real):
-    
-        for widget in self.frame_resultados.winfo_children(): # Limpa os widgets do frame de resultados
-            widget.destroy()
+    @staticmethod
+    def executar_exportacao(parametros, prazo_anos, adicionar_sigla, eixos_sensibilidade, indice_aporte): # Função executada em segundo plano que calcula a projeção (e a grade de sensibilidade, se houver) e gera o relatório em PDF (retorna o nome do arquivo)
+        resultado = Interface.executar_projecao(*parametros)
+        sensibilidade = None
+        if eixos_sensibilidade is not None: # A grade do relatório usa o capital e a inflação do próprio relatório
+            capital_inicial, _, taxa_inflacao, _, _ = parametros
+            sensibilidade = Interface.executar_sensibilidade(capital_inicial, taxa_inflacao, eixos_sensibilidade)
+        nome_arquivo = ExportarPDF.gerar_pdf(resultado, prazo_anos, adicionar_sigla, sensibilidade, indice_aporte)
+        if nome_arquivo is None:
+            raise RuntimeError("Não foi possível gerar o relatório em PDF")
+        return nome_arquivo
+
+
+    def concluir_projecao(self, resultado): # Função executada na thread da janela com o resultado do cálculo em segundo plano
+        # Chamada da função para fazer o display dos resultados na janela de interface
+        self.exibir_resultados(resultado)
+
+        # Chamada da função para atualizar (sem recriar a figura) o gráfico da projeção na janela de interface
+        self.obter_grafico().atualizar(resultado)
+
+        # O mapa de calor da sensibilidade continua na janela, recalculado com o capital e a inflação da nova projeção (os mesmos usados no PDF)
+        if self.eixos_sensibilidade is not None:
+            self.sensibilidade = Interface.executar_sensibilidade(resultado.capital_inicial, resultado.taxa_inflacao, self.eixos_sensibilidade)
+            self.exibir_sensibilidade()
+
+
+    def obter_grafico(self): # Função que retorna o gráfico persistente da janela, criando-o no primeiro uso
+        if self.grafico is None:
+            self.grafico = PlotagemGrafico(self.frame_resultados)
+        return self.grafico
+
+
+    # Função para criação / exibição do frame de resultados do projeção (campos ao lado direito do gráfico)
+    def exibir_resultados(self, resultado):
+
+        # Limpa os widgets do frame de resultados, mantendo o canvas persistente do gráfico (o mapa de calor da sensibilidade, redesenhado em seguida com os novos dados, e as bandas da simulação são liberados)
+        grafico = self.obter_grafico()
+        grafico.liberar_sensibilidade()
+        grafico.liberar_simulacao()
+        for widget in self.frame_resultados.winfo_children():
+            if widget is not grafico.widget:
+                widget.destroy()
 
         # Configuração do layout do frame_resultados
         self.frame_resultados.grid_columnconfigure(0, weight=4)  # Coluna para o gráfico (mais espaço)
         self.frame_resultados.grid_columnconfigure(1, weight=1)  # Coluna para os resultados (menos espaço)
         self.frame_resultados.grid_rowconfigure(0, weight=1)  # Permite expansão vertical
 
-        # Plotagem do gráfico à esquerda
-        fig, ax = plt.subplots(figsize=(8, 6))  # Aumenta altura do gráfico (de 4 para 6)
-        ax.plot(range(1, prazo_meses + 1), patrimonio_mensal, label="Valor Nominal com Aporte", color="blue")
-        ax.plot(range(1, prazo_meses + 1), patrimonio_mensal_sem_aporte, label="Valor Nominal Sem Aporte", color="green")
-        ax.plot(range(1, prazo_meses + 1), patrimonio_mensal_real, label="Valor Real com Aporte", color="red")
-        ax.set_title("Projeção Patrimonial")
-
-
-        canvas = FigureCanvasTkAgg(fig, master=self.frame_resultados) # Faz a plotagem do gráfico no frame de resultados
-        canvas.get_tk_widget().grid(row=0, column=0, padx=10, pady=10, sticky="nsew")  # sticky="nsew" para expansão
-        canvas.draw()
-
         # Alinha os campos com os resultados à direita do gráfico
         resultados_frame = ctk.CTkFrame(master=self.frame_resultados)
         resultados_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")  # sticky="nsew" para expansão
@@ -505,25 +665,25 @@ class Interface: # Classe com as configurações da janela de interface gráfica
         # Valor Final Nominal com Aporte
         frame_valor_com_aporte = ctk.CTkFrame(master=grupo1_frame, fg_color="#404040", border_color="#4A90E2", border_width=1)
         frame_valor_com_aporte.grid(row=0, column=0, padx=5, pady=2, sticky="ew")
-        ctk.CTkLabel(master=frame_valor_com_aporte, text=f"Valor Nominal com Aporte: R$ {valor_futuro_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        ctk.CTkLabel(master=frame_valor_com_aporte, text=f"Valor Nominal com Aporte: R$ {resultado.valor_futuro_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
                     font=("Arial", 16, "bold"), text_color="#E0E0E0").pack(pady=10, expand=True)
 
         # Valor Final Real com Aporte
         frame_valor_com_aporte_real = ctk.CTkFrame(master=grupo1_frame, fg_color="#404040", border_color="#4A90E2", border_width=1)
         frame_valor_com_aporte_real.grid(row=1, column=0, padx=5, pady=2, sticky="ew")
-        ctk.CTkLabel(master=frame_valor_com_aporte_real, text=f"Valor Real com Aporte: R$ {valor_futuro_final_real:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        ctk.CTkLabel(master=frame_valor_com_aporte_real, text=f"Valor Real com Aporte: R$ {resultado.valor_futuro_final_real:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
                     font=("Arial", 16, "bold"), text_color='#E0E0E0').pack(pady=10, expand=True)
 
         # Valor Final Nominal sem Aporte
         frame_valor_sem_aporte = ctk.CTkFrame(master=grupo1_frame, fg_color='#404040', border_color="#4A90E2", border_width=1)
         frame_valor_sem_aporte.grid(row=2, column=0, padx=5, pady=2, sticky="ew")
-        ctk.CTkLabel(master=frame_valor_sem_aporte, text=f"Valor Nominal sem Aporte: R$ {valor_futuro_sem_aporte_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        ctk.CTkLabel(master=frame_valor_sem_aporte, text=f"Valor Nominal sem Aporte: R$ {resultado.valor_futuro_sem_aporte_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
                     font=("Arial", 16, "bold"), text_color="#E0E0E0").pack(pady=10, expand=True)
         
         # Valor Final Real sem Aporte
         frame_valor_sem_aporte_real = ctk.CTkFrame(master=grupo1_frame, fg_color='#404040', border_color="#4A90E2", border_width=1)
         frame_valor_sem_aporte_real.grid(row=3, column=0, padx=10, pady=5, sticky="ew")
-        ctk.CTkLabel(master=frame_valor_sem_aporte_real, text=f"Valor Real sem Aporte: R$ {valor_futuro_sem_aporte_final_real:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."), 
+        ctk.CTkLabel(master=frame_valor_sem_aporte_real, text=f"Valor Real sem Aporte: R$ {resultado.valor_futuro_sem_aporte_final_real:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."), 
                      font=("Arial", 16, "bold")).pack(pady=10)
 
         # Linha divisória
@@ -539,56 +699,233 @@ class Interface: # Classe com as configurações da janela de interface gráfica
         # Rendimento Total (Apenas os Juros)
         frame_rendimento_com_aporte = ctk.CTkFrame(master=grupo2_frame, fg_color='#404040', border_color="#4A90E2", border_width=1)
         frame_rendimento_com_aporte.grid(row=0, column=0, padx=5, pady=2, sticky="ew")
-        ctk.CTkLabel(master=frame_rendimento_com_aporte, text=f"Total de Rendimentos dos Juros: R$ {rendimento_juros:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        ctk.CTkLabel(master=frame_rendimento_com_aporte, text=f"Total de Rendimentos dos Juros: R$ {resultado.rendimento_juros:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
                     font=("Arial", 16, "bold"), text_color='#E0E0E0').pack(pady=10, expand=True)
 
         # Renda Perpétua ou Vitalícia
         frame_renda_passiva = ctk.CTkFrame(master=grupo2_frame, fg_color='#404040', border_color="#4A90E2", border_width=1)
         frame_renda_passiva.grid(row=1, column=0, padx=5, pady=2, sticky="ew")
-        ctk.CTkLabel(master=frame_renda_passiva, text=f"Renda Perpétua: R$ {renda_perpetua:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        ctk.CTkLabel(master=frame_renda_passiva, text="Renda Perpétua: Não aplicável" if resultado.renda_perpetua is None else f"Renda Perpétua: R$ {resultado.renda_perpetua:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."), # Sem renda perpétua quando a taxa real não é positiva
                     font=("Arial", 16, "bold"), text_color='#E0E0E0').pack(pady=10, expand=True)
 
         # Valor Total de Aportes (soma)
         frame_total_aportes = ctk.CTkFrame(master=grupo2_frame, fg_color='#404040', border_color="#4A90E2", border_width=1)
         frame_total_aportes.grid(row=2, column=0, padx=5, pady=2, sticky="ew")
-        ctk.CTkLabel(master=frame_total_aportes, text=f"Valor Total de Aportes: R$ {valor_total_aportes:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
+        ctk.CTkLabel(master=frame_total_aportes, text=f"Valor Total de Aportes: R$ {resultado.total_aportes:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
                     font=("Arial", 16, "bold"), text_color='#E0E0E0').pack(pady=10, expand=True)
 
 
 
-class PlotagemGrafico: # Classe com as configurações de plotagem do gráfico da projeção para a janela de interface
+class ExecutorTarefas: # Classe com a fila de tarefas executadas em uma thread de fundo, com os resultados devolvidos à thread do Tk por app.after
 
-    @staticmethod
-    def plotar_grafico(frame_resultados, patrimonio_mensal, patrimonio_mensal_sem_aporte, patrimonio_mensal_real, prazo_meses, patrimonio_mensal_sem_aporte_real):
-        
-        # Criação do DataFrame para armazenar os resultados da projeção
-        df_resultados = pd.DataFrame({
-            'Meses': np.arange(1, prazo_meses + 1),
-            'Valor Nominal com Aporte': patrimonio_mensal,
-            'Valor Nominal sem Aporte': patrimonio_mensal_sem_aporte,
-            'Valor Real com Aporte': patrimonio_mensal_real,
-            'Valor Real sem Aporte': patrimonio_mensal_sem_aporte_real
-        })
-
-        # Configurações da Figura e do Gráfico
-        fig, ax = plt.subplots(figsize=(8, 4)) # Dimensões do gráfico
-        fig.patch.set_facecolor("#2C2F33") # Cor de fundo da área de plotagem
+    def __init__(self, app, ao_mudar_ocupado=None):
+        self.app = app
+        self.ao_mudar_ocupado = ao_mudar_ocupado # Chamada com True / False quando o executor passa a ter / deixa de ter tarefas pendentes
+        self.tarefas = queue.Queue() # (id, tipo, função) a executar na thread de fundo
+        self.resultados = queue.Queue() # (id, sucesso, valor) devolvidos pela thread de fundo
+        self.contador = itertools.count(1)
+        self.atuais = {} # Tipo -> id da tarefa mais recente: as anteriores do mesmo tipo são canceladas (não executadas ou com o resultado descartado)
+        self.pendentes = {} # Id -> (tipo, ao_concluir, ao_falhar) das tarefas ainda sem resultado (acessado apenas na thread do Tk)
+
+        # Uma única thread de fundo: as tarefas são executadas em ordem e nunca em paralelo entre si (o cache LRU das projeções é acessado por uma única thread)
+        threading.Thread(target=self.executar, daemon=True).start()
+        self.app.after(INTERVALO_VERIFICACAO_TAREFAS_MS, self.verificar_resultados)
+
+
+    def enviar(self, tipo, funcao, ao_concluir, ao_falhar): # Função que enfileira uma tarefa, substituindo a tarefa pendente anterior do mesmo tipo
+        id_tarefa = next(self.contador)
+        self.atuais[tipo] = id_tarefa
+        self.pendentes[id_tarefa] = (tipo, ao_concluir, ao_falhar)
+        self.tarefas.put((id_tarefa, tipo, funcao))
+        self.notificar()
+        return id_tarefa
+
+
+    def cancelar(self, tipo): # Função que cancela as tarefas pendentes de um tipo (as que já estão em execução terminam, mas o resultado é descartado)
+        self.atuais[tipo] = None
+
+
+    def ocupado(self, tipo=None): # Função que indica se há tarefas pendentes (de um tipo específico ou de qualquer tipo)
+        return any(tipo is None or tipo_tarefa == tipo for tipo_tarefa, _, _ in self.pendentes.values())
+
+
+    def notificar(self): # Função que informa à janela o estado atual (ocupado ou livre) do executor
+        if self.ao_mudar_ocupado is not None:
+            self.ao_mudar_ocupado(self.ocupado())
+
+
+    def executar(self): # Função da thread de fundo: executa as tarefas da fila que ainda são as mais recentes do seu tipo
+        while True:
+            id_tarefa, tipo, funcao = self.tarefas.get()
+            if self.atuais.get(tipo) != id_tarefa: # Tarefa substituída / cancelada antes de começar
+                self.resultados.put((id_tarefa, False, None))
+                continue
+            try:
+                self.resultados.put((id_tarefa, True, funcao()))
+            except Exception as e:
+                self.resultados.put((id_tarefa, False, e))
+
+
+    def verificar_resultados(self): # Função periódica (thread do Tk) que entrega os resultados às funções de retorno das tarefas ainda válidas
+        try:
+            while True:
+                try:
+                    id_tarefa, sucesso, valor = self.resultados.get_nowait()
+                except queue.Empty:
+                    break
+
+                tipo, ao_concluir, ao_falhar = self.pendentes.pop(id_tarefa)
+                self.notificar() # Atualiza o indicador antes das funções de retorno (que podem abrir caixas de mensagem)
+                if self.atuais.get(tipo) != id_tarefa: # Resultado de uma tarefa substituída / cancelada: descartado
+                    continue
+                self.atuais[tipo] = None
+
+                if not sucesso:
+                    ao_falhar(valor)
+                    continue
+                try:
+                    ao_concluir(valor)
+                except Exception as e: # Erro ao exibir o resultado (na thread do Tk): informado ao usuário como um erro da própria tarefa
+                    ao_falhar(e)
+        finally:
+            self.app.after(INTERVALO_VERIFICACAO_TAREFAS_MS, self.verificar_resultados) # Reagendada mesmo se uma função de retorno falhar
+
+
+
+class CursorProjecao: # Classe com o cursor interativo do gráfico da projeção (linha vertical + caixa com os valores de todas as séries no mês sob o mouse, redesenhados por blit)
+
+    def __init__(self, canvas, ax):
+        self.canvas = canvas
+        self.ax = ax
+        self.fundo = None # Imagem do gráfico sem o cursor (capturada a cada redesenho completo)
+        self.indice = None # Índice do mês exibido no momento (None = cursor oculto)
+        self.meses = np.empty(0)
+        self.series = [] # Lista de (nome, array da série, cor) das séries visíveis
+
+        # Artistas reutilizados em todos os movimentos do mouse ('animated' os exclui do desenho normal da figura)
+        self.linha_vertical = ax.axvline(0, color='#FFFFFF', linestyle=':', linewidth=1, animated=True, visible=False)
+        self.marcadores = ax.scatter([], [], s=30, zorder=5, animated=True, visible=False)
+        self.anotacao = ax.annotate("", xy=(0, 0.5), xycoords=ax.get_xaxis_transform(), xytext=(12, 0), textcoords='offset points', # Posição: mês no eixo X e meio da altura da área de plotagem
+                                    color='#FFFFFF', fontsize=8, va='center', multialignment='left', bbox=dict(boxstyle='round,pad=0.4', fc='#1E90FF', alpha=0.8), animated=True, visible=False)
+
+        # Eventos conectados uma única vez (desconectados em desconectar)
+        self.conexoes = [
+            canvas.mpl_connect('draw_event', self.ao_desenhar),
+            canvas.mpl_connect('motion_notify_event', self.ao_mover),
+            canvas.mpl_connect('axes_leave_event', self.ao_sair),
+            canvas.mpl_connect('figure_leave_event', self.ao_sair),
+            ]
+
+
+    def definir_dados(self, meses, series): # Função que define os arrays (resolução completa) consultados pelo cursor e oculta o cursor atual
+        self.meses = np.asarray(meses, dtype=float)
+        self.series = [(nome, np.asarray(valores, dtype=float), cor) for nome, valores, cor in series]
+        self.fundo = None # O fundo atual deixa de valer: será capturado no próximo redesenho completo
+        self.ocultar()
+
+
+    def ao_desenhar(self, event): # Função que captura o fundo do gráfico após cada redesenho completo (figura nova, redimensionamento ou novos dados)
+        self.fundo = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.indice is not None:
+            self.desenhar_artistas()
+
+
+    def ao_mover(self, event): # Função que posiciona o cursor no mês mais próximo do mouse (busca binária no array de meses)
+        if event.inaxes is not self.ax or event.xdata is None or not len(self.meses) or not self.series:
+            self.ocultar()
+            return
+
+        # Mês mais próximo entre os vizinhos retornados pelo searchsorted
+        indice = int(np.searchsorted(self.meses, event.xdata))
+        if indice >= len(self.meses) or (indice > 0 and event.xdata - self.meses[indice - 1] < self.meses[indice] - event.xdata):
+            indice -= 1
+
+        if indice == self.indice: # Mesmo mês já exibido: nada a redesenhar
+            return
+        self.indice = indice
+
+        mes = self.meses[indice]
+        valores = [valores[indice] for _, valores, _ in self.series]
+        linhas_texto = [f"Mês: {int(mes)}"] + [f"{nome}: R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for (nome, _, _), valor in zip(self.series, valores)]
+
+        self.linha_vertical.set_xdata([mes, mes])
+        self.marcadores.set_offsets(np.column_stack([np.full(len(valores), mes), valores]))
+        self.marcadores.set_facecolor([cor for _, _, cor in self.series])
+        self.anotacao.set_text("\n".join(linhas_texto))
+        self.anotacao.xy = (mes, 0.5)
+
+        # Caixa à esquerda do cursor na metade direita do gráfico (evita que ela saia da área de plotagem)
+        inicio, fim = self.ax.get_xlim()
+        a_direita = mes > (inicio + fim) / 2
+        self.anotacao.set_position((-12 if a_direita else 12, 0))
+        self.anotacao.set_horizontalalignment('right' if a_direita else 'left')
+
+        for artista in (self.linha_vertical, self.marcadores, self.anotacao):
+            artista.set_visible(True)
+        self.blit()
+
+
+    def ao_sair(self, event): # Função que oculta o cursor quando o mouse sai da área de plotagem
+        self.ocultar()
+
+
+    def ocultar(self): # Função que oculta o cursor (restaurando o fundo capturado)
+        if self.indice is None:
+            return
+        self.indice = None
+        for artista in (self.linha_vertical, self.marcadores, self.anotacao):
+            artista.set_visible(False)
+        self.blit()
+
+
+    def desenhar_artistas(self): # Função que desenha apenas os artistas do cursor sobre a área atual
+        for artista in (self.linha_vertical, self.marcadores, self.anotacao):
+            self.ax.draw_artist(artista)
+
+
+    def blit(self): # Função que restaura o fundo e redesenha somente o cursor (sem redesenhar a figura inteira)
+        if self.fundo is None:
+            return
+        self.canvas.restore_region(self.fundo)
+        if self.indice is not None:
+            self.desenhar_artistas()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+    def desconectar(self): # Função que desconecta os eventos do cursor e remove seus artistas
+        for conexao in self.conexoes:
+            self.canvas.mpl_disconnect(conexao)
+        self.conexoes = []
+        for artista in (self.linha_vertical, self.marcadores, self.anotacao):
+            artista.remove()
+        self.fundo = None
+
+
+
+class PlotagemGrafico: # Classe com o gráfico PERSISTENTE da projeção na janela de interface (uma figura / canvas por janela, atualizados a cada cálculo)
+
+    # Séries de Valores para Plotagem: (nome, atributo do resultado, cor, estilo da linha)
+    SERIES = (
+        ('Valor Nominal com Aporte', 'patrimonio_mensal', '#1E90FF', '--'), # Azul
+        ('Valor Real com Aporte', 'patrimonio_mensal_real', '#FFFFFF', '-'), # Branco
+        ('Valor Nominal sem Aporte', 'patrimonio_mensal_sem_aporte', '#A6D425', '--'), # Verde
+        ('Valor Real sem Aporte', 'patrimonio_mensal_sem_aporte_real', '#FF0000', '--') # Vermelho
+        )
+
+    def __init__(self, frame_resultados):
+        self.frame_resultados = frame_resultados
+
+        # Configurações da Figura e do Gráfico (Figure do matplotlib, fora do gerenciador do pyplot, para ser liberada junto com o canvas)
+        self.fig = Figure(figsize=(8, 4)) # Dimensões do gráfico
+        self.ax = self.fig.add_subplot()
+        self.fig.patch.set_facecolor("#2C2F33") # Cor de fundo da área de plotagem
+        ax = self.ax
         ax.set_facecolor("#2C2F33") # Cor de fundo do gráfico
         ax.set_xlabel('Meses') # Título do Eixo X
         ax.set_ylabel('Valor') # Título do Eixo Y
 
-        # Plotagem das Linhas (com verificação para criação dinâmica da legenda)
-        if patrimonio_mensal and any(patrimonio_mensal):
-            sns.lineplot(x='Meses', y='Valor Nominal com Aporte', data=df_resultados, ax=ax, label='Valor Nominal com Aporte', color='#1E90FF', linestyle='--', linewidth=2) # Azul
-        
-        if patrimonio_mensal_sem_aporte and any(patrimonio_mensal_sem_aporte):
-            sns.lineplot(x='Meses', y='Valor Real com Aporte', data=df_resultados, ax=ax, label='Valor Real com Aporte', color='#FFFFFF', linestyle='-', linewidth=2) # Branco
-        
-        if patrimonio_mensal_real and any(patrimonio_mensal_real):
-            sns.lineplot(x='Meses', y='Valor Nominal sem Aporte', data=df_resultados, ax=ax, label='Valor Nominal sem Aporte', color='#A6D425', linestyle='--', linewidth=2) # Verde
-        
-        if patrimonio_mensal_sem_aporte_real and any(patrimonio_mensal_sem_aporte_real):
-            sns.lineplot(x='Meses', y='Valor Real sem Aporte', data=df_resultados, ax=ax, label='Valor Real sem Aporte', color="#FF0000", linestyle='--', linewidth=2) # Vermelho
+        # Uma linha (Line2D) por série, criada uma única vez e atualizada com set_data a cada cálculo
+        self.linhas = [ax.plot([], [], label=nome, color=cor, linestyle=estilo, linewidth=2)[0] for nome, _, cor, estilo in PlotagemGrafico.SERIES]
 
         # Configuração das Linhas de Grade e Bordas da Plotagem
         ax.grid(True, which='major', axis='x', color='gray', linestyle='--', linewidth=0.3)
@@ -604,73 +941,208 @@ class PlotagemGrafico: # Classe com as configurações de plotagem do gráfico d
         ax.tick_params(axis='y', colors='#FFFFFF')
 
         # Configuração do Intervalo dos Valores no Eixo X (De 12 em 12 meses)
-        ax.xaxis.set_major_locator(plt.MultipleLocator(12))
-        ax.xaxis.set_minor_locator(plt.MultipleLocator(1))
-
-        # Configuração de Limite das Dimensões da Plotagem
-        ax.set_xlim([1, prazo_meses])
-
+        ax.xaxis.set_major_locator(MultipleLocator(12))
+        ax.xaxis.set_minor_locator(MultipleLocator(1))
 
         # Função para formatar os valores do eixo Y
-        def formatar_valores_y(valor, pos): 
+        def formatar_valores_y(valor, pos):
             return f"{valor:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
         ax.yaxis.set_major_formatter(FuncFormatter(formatar_valores_y))
 
+        # Converte o gráfico para um widget do Tkinter (o mesmo canvas é reaproveitado por toda a sessão)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=frame_resultados)
+        self.widget = self.canvas.get_tk_widget()
 
-        # Configuração do cursor interativo do gráfico
-        cursor = mplcursors.cursor(ax, hover=True)
+        # Configuração do cursor interativo do gráfico (criado uma única vez sobre o canvas persistente)
+        self.cursor = CursorProjecao(self.canvas, ax)
 
-        @cursor.connect("add") # Cria um cursor interativo para exibir o valor em determinado ponto do gráfico
-        def on_add(sel):
-            sel.annotation.set_text(f"Mês: {int(sel.target[0])}\nValor: R$ {sel.target[1]:,.2f}")
-            sel.annotation.get_bbox_patch().set(facecolor="#1E90FF", alpha=0.8)
+        # Séries em resolução completa de cada linha: as linhas recebem apenas os pontos reduzidos à largura atual do canvas (recalculados ao redimensionar)
+        self.dados = [] # Lista de (linha, meses, série)
+        self.conexao_redimensionar = self.canvas.mpl_connect('resize_event', lambda event: self.reduzir_linhas())
 
+        # Figura / canvas do mapa de calor da análise de sensibilidade (criados sob demanda)
+        self.fig_sensibilidade = None
+        self.canvas_sensibilidade = None
 
-        def on_enter(event): # Cria o cursor quando o mouse entra na área de plotagem do gráfico
-            nonlocal cursor
-            if cursor is None:
-                cursor = mplcursors.cursor(ax, hover=True)
+        # Figura / canvas das bandas de percentis da simulação (criados sob demanda, abaixo do mapa de calor)
+        self.fig_simulacao = None
+        self.canvas_simulacao = None
 
-            @cursor.connect("add")
-            def on_add(sel):
-                sel.annotation.set_text(f"Mês: {int(sel.target[0])}\nValor: R$ {sel.target[1]:,.2f}")
-                sel.annotation.get_bbox_patch().set(facecolor="#1E90FF", alpha=0.8)
 
+    @staticmethod
+    def indices_reduzidos(valores, largura_pixels): # Função que retorna os índices dos pontos a plotar: mínimo e máximo de cada faixa de 2 pixels, além do primeiro e do último ponto (preserva a forma e os extremos da série com ~1 ponto por pixel)
+        quantidade = len(valores)
+        quantidade_faixas = largura_pixels // 2
+        if quantidade_faixas < 1 or quantidade <= largura_pixels: # Séries com até 1 ponto por pixel são plotadas por completo
+            return np.arange(quantidade)
 
-        def on_leave(event): # Remove o cursor quando o mouse sai da área de plotagem do gráfico
-            nonlocal cursor
-            if cursor is not None:
-                cursor.remove()
-                cursor = None
-        
-        # Converte o gráfico para um widget do Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=frame_resultados) 
-        
-        # Conectando os eventos de entrada e saída do mouse da área de plotagem
-        canvas.mpl_connect('figure_leave_event', on_leave)
-        canvas.mpl_connect('figure_enter_event', on_enter)
+        # Faixa (2 colunas de pixels) de cada ponto e ordenação dos valores dentro de cada faixa
+        limites = np.linspace(0, quantidade, quantidade_faixas + 1).astype(int)
+        faixas = np.repeat(np.arange(quantidade_faixas), np.diff(limites))
+        ordem = np.lexsort((valores, faixas))
 
-        # Posiciona e exibe o gráfico na janela de interface
-        canvas.get_tk_widget().grid(row=0, column=0, padx=10, pady=10, sticky='nsew')
-        canvas.draw() # Renderiza o gráfico na janela de interface
+        # O primeiro ponto ordenado de cada faixa é o mínimo e o último é o máximo
+        return np.unique(np.concatenate(([0, quantidade - 1], ordem[limites[:-1]], ordem[limites[1:] - 1])))
+
+
+    def reduzir_linhas(self): # Função que aplica às linhas os pontos reduzidos à largura atual (em pixels) da área de plotagem
+        largura = int(self.ax.bbox.width)
+        for linha, meses, serie in self.dados:
+            indices = PlotagemGrafico.indices_reduzidos(serie, largura)
+            linha.set_data(meses[indices], serie[indices])
+
+
+    def atualizar(self, resultado): # Função que atualiza as linhas, limites e legenda do gráfico com uma nova projeção, sem recriar a figura
+        meses = np.asarray(resultado.meses)
+        self.dados = []
+        for linha, (_, atributo, _, _) in zip(self.linhas, PlotagemGrafico.SERIES):
+            serie = np.asarray(getattr(resultado, atributo), dtype=float)
+            self.dados.append((linha, meses, serie))
+            linha.set_visible(bool(len(serie) and np.any(serie))) # Séries zeradas ficam ocultas (e fora da legenda)
+        self.reduzir_linhas()
+
+        # Configuração de Limite das Dimensões da Plotagem
+        self.ax.set_xlim([1, max(resultado.prazo_meses, 2)])
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view(scalex=False)
+
+        # Legenda apenas com as séries visíveis
+        visiveis = [linha for linha in self.linhas if linha.get_visible()]
+        self.ax.legend(handles=visiveis)
+
+        # Séries visíveis consultadas pelo cursor interativo (em resolução completa, não as reduzidas)
+        self.cursor.definir_dados(meses, [(linha.get_label(), serie, linha.get_color()) for linha, _, serie in self.dados if linha.get_visible()])
+
+        # Posiciona (se necessário) e redesenha o gráfico na janela de interface
+        self.widget.grid(row=0, column=0, padx=10, pady=10, sticky='nsew')
+        self.canvas.draw_idle()
+
+
+    def liberar_sensibilidade(self): # Função que libera a figura e o widget do mapa de calor da sensibilidade
+        if self.canvas_sensibilidade is not None:
+            self.canvas_sensibilidade.get_tk_widget().destroy()
+            self.fig_sensibilidade.clear()
+            self.fig_sensibilidade = None
+            self.canvas_sensibilidade = None
+
+
+    def liberar_simulacao(self): # Função que libera a figura e o widget das bandas de percentis da simulação
+        if self.canvas_simulacao is not None:
+            self.canvas_simulacao.get_tk_widget().destroy()
+            self.fig_simulacao.clear()
+            self.fig_simulacao = None
+            self.canvas_simulacao = None
+
+
+    def liberar(self): # Função que libera explicitamente as figuras, o cursor e os widgets do gráfico
+        self.liberar_sensibilidade()
+        self.liberar_simulacao()
+        self.cursor.desconectar()
+        self.canvas.mpl_disconnect(self.conexao_redimensionar)
+        self.dados = []
+        self.widget.destroy()
+        self.fig.clear()
+
+
+    def plotar_sensibilidade(self, sensibilidade, indice_aporte): # Função para plotar os mapas de calor (taxa x prazo) dos valores finais nominal e real para um nível de aporte da grade
+
+        # Figura / canvas do mapa de calor reaproveitados entre as trocas de nível de aporte (apenas o conteúdo é redesenhado)
+        if self.fig_sensibilidade is None:
+            self.fig_sensibilidade = Figure(figsize=(10, 4))
+            self.fig_sensibilidade.patch.set_facecolor("#2C2F33")
+            self.canvas_sensibilidade = FigureCanvasTkAgg(self.fig_sensibilidade, master=self.frame_resultados)
+            self.canvas_sensibilidade.get_tk_widget().grid(row=1, column=0, padx=10, pady=10, sticky='nsew')
+
+        fig = self.fig_sensibilidade
+        fig.clear()
+        eixos = fig.subplots(1, 2)
+
+        taxas = sensibilidade['Taxas Anuais'] * 100
+        prazos = sensibilidade['Prazos (Anos)']
+        formatar_valores = FuncFormatter(lambda valor, pos: f"{valor:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."))
+
+        # Rótulos de no máximo 10 marcas por eixo (grades densas teriam rótulos sobrepostos)
+        marcas_x = np.unique(np.linspace(0, len(prazos) - 1, min(len(prazos), 10)).astype(int))
+        marcas_y = np.unique(np.linspace(0, len(taxas) - 1, min(len(taxas), 10)).astype(int))
+
+        for ax, titulo, chave in zip(eixos, ("Valor Nominal Final", "Valor Real Final"), ('Valor Futuro Final', 'Valor Futuro Final Real')):
+            imagem = ax.imshow(sensibilidade[chave][:, :, indice_aporte], origin='lower', aspect='auto', cmap='viridis')
+            ax.set_title(titulo, color='#FFFFFF')
+            ax.set_xlabel('Prazo (Anos)')
+            ax.set_ylabel('Taxa de Juros (% a.a.)')
+            ax.set_xticks(marcas_x)
+            ax.set_xticklabels([f"{prazos[i]}" for i in marcas_x])
+            ax.set_yticks(marcas_y)
+            ax.set_yticklabels([f"{taxas[i]:.2f}".replace(".", ",") for i in marcas_y])
+            ax.xaxis.label.set_color('#FFFFFF')
+            ax.yaxis.label.set_color('#FFFFFF')
+            ax.tick_params(axis='x', colors='#FFFFFF')
+            ax.tick_params(axis='y', colors='#FFFFFF')
+
+            barra = fig.colorbar(imagem, ax=ax, format=formatar_valores)
+            barra.ax.tick_params(colors='#FFFFFF')
+
+        fig.tight_layout()
+
+        self.canvas_sensibilidade.draw_idle()
+
+
+
+    def plotar_simulacao(self, simulacao): # Função para plotar as bandas de percentis (P5 / P50 / P95) de uma simulação Monte Carlo ou de bootstrap histórico
+
+        # Figura / canvas da simulação reaproveitados entre as chamadas (apenas o conteúdo é redesenhado), em uma linha própria do frame de resultados
+        if self.fig_simulacao is None:
+            self.fig_simulacao = Figure(figsize=(8, 4)) # Dimensões do gráfico
+            self.canvas_simulacao = FigureCanvasTkAgg(self.fig_simulacao, master=self.frame_resultados)
+            self.canvas_simulacao.get_tk_widget().grid(row=2, column=0, padx=10, pady=10, sticky='nsew')
+
+        fig = self.fig_simulacao
+        fig.clear()
+        ax = fig.add_subplot()
+        fig.patch.set_facecolor("#2C2F33") # Cor de fundo da área de plotagem
+        ax.set_facecolor("#2C2F33") # Cor de fundo do gráfico
+        ax.set_xlabel('Meses') # Título do Eixo X
+        ax.set_ylabel('Valor') # Título do Eixo Y
+
+        meses = np.asarray(simulacao['Meses'])
+        p_inferior, p_mediano, p_superior = simulacao['Percentis']
+        largura = int(ax.bbox.width) # Largura (em pixels) da área de plotagem usada na redução de pontos
+
+        # Mediana como linha e a faixa entre os percentis inferior e superior como área sombreada (a faixa usa os pontos extremos das duas bordas)
+        for nome, bandas, cor in (('Valor Nominal', simulacao['Patrimônio Nominal'], '#1E90FF'), ('Valor Real', simulacao['Patrimônio Real'], '#FFFFFF')):
+            indices = np.union1d(PlotagemGrafico.indices_reduzidos(bandas[0], largura), PlotagemGrafico.indices_reduzidos(bandas[2], largura))
+            ax.fill_between(meses[indices], bandas[0][indices], bandas[2][indices], color=cor, alpha=0.2, linewidth=0, label=f"{nome} (P{p_inferior} - P{p_superior})")
+            indices = PlotagemGrafico.indices_reduzidos(bandas[1], largura)
+            ax.plot(meses[indices], bandas[1][indices], color=cor, linestyle='-', linewidth=2, label=f"{nome} (P{p_mediano})")
+
+        # Configuração das Linhas de Grade, Bordas e Eixos (mesmo estilo do gráfico da projeção)
+        ax.grid(True, which='major', axis='x', color='gray', linestyle='--', linewidth=0.3)
+        ax.spines['top'].set_color('#2C2F33')
+        ax.spines['right'].set_color('#2C2F33')
+        ax.spines['left'].set_color('#FFFFFF')
+        ax.spines['bottom'].set_color('#FFFFFF')
+        ax.xaxis.label.set_color('#FFFFFF')
+        ax.yaxis.label.set_color('#FFFFFF')
+        ax.tick_params(axis='x', colors='#FFFFFF')
+        ax.tick_params(axis='y', colors='#FFFFFF')
+        ax.xaxis.set_major_locator(MultipleLocator(12))
+        ax.set_xlim([1, len(meses)])
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda valor, pos: f"{valor:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")))
+        ax.legend()
+
+        self.canvas_simulacao.draw_idle()
 
 
 
 class PlotagemGraficoPDF:  # Classe com as configurações de plotagem do gráfico da projeção para o arquivo PDF
     @staticmethod
-    def criar_grafico_pdf(patrimonio_mensal_real, patrimonio_mensal, patrimonio_mensal_sem_aporte, prazo_meses, patrimonio_mensal_sem_aporte_real):
-        df_resultados_pdf = pd.DataFrame({
-            'Meses': np.arange(1, prazo_meses + 1),
-            'Valor Nominal com Aporte': patrimonio_mensal,
-            'Valor Nominal sem Aporte': patrimonio_mensal_sem_aporte,
-            'Valor Real com Aporte': patrimonio_mensal_real,
-            'Valor Real sem Aporte': patrimonio_mensal_sem_aporte_real
-        })
-
-        # Configurações da Figura e do Gráfico
-        fig, ax = plt.subplots(figsize=(16, 10)) # Dimensões do Gráfico
-        plt.subplots_adjust(left=0.07, right=0.97, top=0.95, bottom=0.15) # Ajustes no Posicionamento do Gráfico
+    def criar_grafico_pdf(resultado):
+
+        # Configurações da Figura e do Gráfico (Figure fora do gerenciador do pyplot)
+        fig = Figure(figsize=(16, 10)) # Dimensões do Gráfico
+        ax = fig.add_subplot()
+        fig.subplots_adjust(left=0.07, right=0.97, top=0.95, bottom=0.15) # Ajustes no Posicionamento do Gráfico
         fig.patch.set_facecolor('#FFFFFF') # Cor de Fundo da Figura
         ax.set_facecolor('#FFFFFF') # Cor de Fundo da Área de Plotagem
         ax.set_xlabel('Ano') # Nome Eixo X
@@ -682,24 +1154,29 @@ class PlotagemGraficoPDF:  # Classe com as configurações de plotagem do gráfi
 
         # Séries de Valores para Plotagem
         series_info = [
-            ("Valor Nominal com Aporte", patrimonio_mensal, '#1F77B4', '--'), # Azul
-            ("Valor Real com Aporte", patrimonio_mensal_real, '#FF7F0E', '-'), # Laranja
-            ("Valor Nominal sem Aporte", patrimonio_mensal_sem_aporte, "#000000", '--'), # Preto
-            ("Valor Real sem Aporte", patrimonio_mensal_sem_aporte_real, '#FF0000', '-' ) # Vermelho
+            ("Valor Nominal com Aporte", resultado.patrimonio_mensal, '#1F77B4', '--'), # Azul
+            ("Valor Real com Aporte", resultado.patrimonio_mensal_real, '#FF7F0E', '-'), # Laranja
+            ("Valor Nominal sem Aporte", resultado.patrimonio_mensal_sem_aporte, "#000000", '--'), # Preto
+            ("Valor Real sem Aporte", resultado.patrimonio_mensal_sem_aporte_real, '#FF0000', '-' ) # Vermelho
             ]
 
-        # Plotagem das Linhas no Gráfico (com caixas de anotação para o valor final)
+        # Largura (em pontos) da área de plotagem na imagem como inserida no PDF (reduzida para caber em LARGURA / ALTURA_MAXIMA_GRAFICO_PDF), usada na redução de pontos das séries
+        escala = min(LARGURA_MAXIMA_GRAFICO_PDF / (fig.get_figwidth() * 72), ALTURA_MAXIMA_GRAFICO_PDF / (fig.get_figheight() * 72))
+        largura = int(ax.bbox.width / fig.dpi * 72 * escala)
+        meses = np.asarray(resultado.meses)
+
+        # Plotagem das Linhas no Gráfico direto dos arrays (com caixas de anotação para o valor final)
         for nome, serie, cor, estilo in series_info:
-            if serie and any(serie):
-                sns.lineplot(x='Meses', y=nome, data=df_resultados_pdf, ax=ax,
-                             label=nome, color=cor, linestyle=estilo, linewidth=3.2, legend=False)
+            if len(serie) and np.any(serie):
+                indices = PlotagemGrafico.indices_reduzidos(serie, largura)
+                ax.plot(meses[indices], serie[indices], label=nome, color=cor, linestyle=estilo, linewidth=3.2)
 
                 valor_final = serie[-1]
                 texto_box = f"R$ {valor_final:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
                 ax.annotate( # Cria a caixa de anotação com o valor do último período da projeção (valor final)
                     texto_box,
-                    xy=(prazo_meses, valor_final),
+                    xy=(resultado.prazo_meses, valor_final),
                     xytext=(10, -10),
                     textcoords='offset points',
                     fontsize=16,
@@ -733,9 +1210,9 @@ class PlotagemGraficoPDF:  # Classe com as configurações de plotagem do gráfi
             )
 
         # Configuração das Linhas de Grade no Eixo X em anos
-        ax.xaxis.set_major_locator(plt.MultipleLocator(12))
-        ax.xaxis.set_minor_locator(plt.MultipleLocator(1))
-        ax.set_xlim([1, prazo_meses])
+        ax.xaxis.set_major_locator(MultipleLocator(12))
+        ax.xaxis.set_minor_locator(MultipleLocator(1))
+        ax.set_xlim([1, resultado.prazo_meses])
 
         # Função auxiliar para formatar os valores no eixo X
         def formatar_valores_x(valor, pos):
@@ -756,18 +1233,14 @@ class PlotagemGraficoPDF:  # Classe com as configurações de plotagem do gráfi
 class ExportarPDF:  # Classe com a criação e configuração do arquivo PDF com os dados de entrada e resultados da projeção
 
     @staticmethod
-    def gerar_pdf(capital_inicial, prazo_anos, taxa_juros, valor_futuro_final, valor_futuro_sem_aporte_final, rendimento_juros, patrimonio_mensal, patrimonio_mensal_real,
-                  patrimonio_mensal_sem_aporte, prazo_meses, aportes_por_periodo, renda_perpetua, adicionar_sigla, valor_futuro_real_final, taxa_juros_real, taxa_inflacao, 
-                  valor_total_aportes, valor_futuro_sem_aporte_final_real, patrimonio_mensal_sem_aporte_real):  # Função principal para criação do arquivo PDF
+    def gerar_pdf(resultado, prazo_anos, adicionar_sigla, sensibilidade=None, indice_aporte=0):  # Função principal para criação do arquivo PDF (com a tabela da análise de sensibilidade, se calculada); retorna o nome do arquivo gerado, sem usar a janela (pode rodar fora da thread do Tk)
         
         # Criação da imagem do gráfico
         nome_imagem = "grafico_projecao.png"        
         try:
-            fig, _ = PlotagemGraficoPDF.criar_grafico_pdf(patrimonio_mensal_real, patrimonio_mensal, patrimonio_mensal_sem_aporte, prazo_meses,
-                                                          patrimonio_mensal_sem_aporte_real)
+            fig, _ = PlotagemGraficoPDF.criar_grafico_pdf(resultado)
             
-            fig.savefig(nome_imagem, dpi=200, bbox_inches='tight') # Salva a imagem do gráfico (elimina bordas em branco // resolução de 200 DPI)
-            plt.close(fig)
+            fig.savefig(nome_imagem, dpi=DPI_GRAFICO_PDF, bbox_inches='tight') # Salva a imagem do gráfico (elimina bordas em branco // resolução de 200 DPI)
 
             if not os.path.exists(nome_imagem):  # Verifica se a imagem foi criada corretamente no diretório do programa
                 raise FileNotFoundError(f"O arquivo {nome_imagem} não foi gerado")
@@ -846,22 +1319,17 @@ class ExportarPDF:  # Classe com a criação e configuração do arquivo PDF com
         template = PageTemplate(id='AllPages', frames=[frame], onPage=criar_cabecalho, onPageEnd=criar_rodape)
         doc.addPageTemplates([template])
 
-        # Converte as taxas de MENSAL para ANUAL para o display no PDF
-        taxa_juros_PDF = CalculosProjecao.taxa_equivalente(taxa_juros, 1, 12)
-        taxa_inflacao_PDF = CalculosProjecao.taxa_equivalente(taxa_inflacao, 1, 12)
-        taxa_juros_real_PDF = CalculosProjecao.taxa_equivalente(taxa_juros_real, 1, 12)
-
-        # Gera a Tabela com os Dados de Entrada (inputs)
+        # Gera a Tabela com os Dados de Entrada (inputs), com as taxas convertidas de MENSAL para ANUAL
         dados_inputs = [
             ["Descrição", "Valor"],
-            ["Capital Inicial", f"R$ {capital_inicial:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
+            ["Capital Inicial", f"R$ {resultado.capital_inicial:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
             ["Prazo (Anos)", prazo_anos],
-            ["Taxa de Juros Nominal", f"{taxa_juros_PDF * 100:.2f}% a.a"],
-            ["Taxa de Inflação Esperada", f"{taxa_inflacao_PDF * 100:.2f}% a.a"],
-            ["Taxa de Juros Real", f"{taxa_juros_real_PDF * 100:.2f}% a.a"]
+            ["Taxa de Juros Nominal", ExportarPDF.formatar_taxa_anual(resultado.taxa_juros)],
+            ["Taxa de Inflação Esperada", ExportarPDF.formatar_taxa_anual(resultado.taxa_inflacao)],
+            ["Taxa de Juros Real", ExportarPDF.formatar_taxa_anual(resultado.taxa_juros_real)]
         ]
 
-        for i, (aporte, duracao_meses) in enumerate(aportes_por_periodo, start=1):
+        for i, (aporte, duracao_meses) in enumerate(resultado.aportes_por_periodo, start=1):
             dados_inputs.append([f"Aportes - Período {i}", f"R$ {aporte:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".") + f" por {duracao_meses} meses"])
 
         # Cria a Tabela com os Dados de Entrada
@@ -882,10 +1350,10 @@ class ExportarPDF:  # Classe com a criação e configuração do arquivo PDF com
         # Cria a Tabela com os Dados de Saída (outputs > resultados)
         dados_resultados = [
             ["Descrição", "Valor"],
-            ["Valor Nominal com Aporte", f"R$ {valor_futuro_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
-            ["Valor Real com Aporte", f"R$ {valor_futuro_real_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
-            ["Valor Nominal sem Aporte", f"R$ {valor_futuro_sem_aporte_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
-            ["Valor Real sem Aporte", f"R$ {valor_futuro_sem_aporte_final_real:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")]
+            ["Valor Nominal com Aporte", f"R$ {resultado.valor_futuro_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
+            ["Valor Real com Aporte", f"R$ {resultado.valor_futuro_final_real:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
+            ["Valor Nominal sem Aporte", f"R$ {resultado.valor_futuro_sem_aporte_final:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
+            ["Valor Real sem Aporte", f"R$ {resultado.valor_futuro_sem_aporte_final_real:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")]
         ]
 
         tabela_resultados = Table(dados_resultados, colWidths=[200, 200])
@@ -904,9 +1372,9 @@ class ExportarPDF:  # Classe com a criação e configuração do arquivo PDF com
 
         # Cria a Tabela com os Resultados de Cálculos Auxiliares (outputs)
         dados_resultados_aux = [
-            ["Rendimento Total dos Juros", f"R$ {rendimento_juros:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
-            ["Renda Perpétua", f"R$ {renda_perpetua:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
-            ["Valor Total de Aportes", f"R$ {valor_total_aportes:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
+            ["Rendimento Total dos Juros", f"R$ {resultado.rendimento_juros:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
+            ["Renda Perpétua", "Não aplicável" if resultado.renda_perpetua is None else f"R$ {resultado.renda_perpetua:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")], # Sem renda perpétua quando a taxa real não é positiva
+            ["Valor Total de Aportes", f"R$ {resultado.total_aportes:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")],
         ]
 
         tabela_resultados_aux = Table(dados_resultados_aux, colWidths=[200, 200])
@@ -921,18 +1389,22 @@ class ExportarPDF:  # Classe com a criação e configuração do arquivo PDF com
         elements.append(tabela_resultados_aux)
         elements.append(Spacer(1, 20))
 
+        # Cria as Tabelas da Análise de Sensibilidade (taxas nas linhas, prazos nas colunas) para o nível de aporte selecionado
+        if sensibilidade is not None:
+            elements.extend(ExportarPDF.criar_tabelas_sensibilidade(sensibilidade, indice_aporte, styles))
+
         # Posiciona a imagem do gráfico no relatório
         try:
             with PILImage.open(nome_imagem) as img:
                 # Obtém as dimensões originais em pixels
                 largura_original, altura_original = img.size
-                dpi = 200  # Mesma DPI usada no salvamento
+                dpi = DPI_GRAFICO_PDF  # Mesma DPI usada no salvamento
                 largura_pontos = largura_original / dpi * 72  # Converte pixels para pontos
                 altura_pontos = altura_original / dpi * 72
 
                 # Define um tamanho máximo para caber na página letter (ajuste conforme necessário)
-                max_largura = 500  # Aproximadamente 6.94 polegadas
-                max_altura = 300   # Aproximadamente 4.17 polegadas
+                max_largura = LARGURA_MAXIMA_GRAFICO_PDF
+                max_altura = ALTURA_MAXIMA_GRAFICO_PDF
 
                 # Calcula a escala para manter a proporção
                 escala = min(max_largura / largura_pontos, max_altura / altura_pontos)
@@ -951,7 +1423,7 @@ class ExportarPDF:  # Classe com a criação e configuração do arquivo PDF com
         try:
             doc.build(elements)
             print(f"PDF gerado com sucesso: {nome_arquivo}")
-            messagebox.showinfo("Sucesso", f"Relatório gerado com sucesso: {nome_arquivo}", icon='info')  # Caixa de mensagem de sucesso na geração do PDF
+            return nome_arquivo  # A caixa de mensagem de sucesso é exibida pela janela ao receber o resultado
         except Exception as e:
             print(f"Erro ao gerar o PDF: {e}")
             import traceback
@@ -959,6 +1431,59 @@ class ExportarPDF:  # Classe com a criação e configuração do arquivo PDF com
 
 
 
+    @staticmethod
+    def formatar_taxa_anual(taxa_mensal): # Função que formata uma taxa mensal (fixa ou curva de taxas mensais) como taxa ANUAL equivalente para o PDF
+        # Conversão direta em vez de taxa_equivalente: a taxa real (e a inflação) podem ser negativas, e a curva é um vetor
+        taxas = np.asarray(taxa_mensal, dtype=np.float64)
+        if taxas.ndim == 0:
+            return f"{((1 + float(taxas)) ** 12 - 1) * 100:.2f}% a.a"
+
+        taxas_anuais = (1 + taxas) ** 12 - 1
+        if len(taxas) == 0 or np.ptp(taxas_anuais) == 0:
+            return f"{(taxas_anuais[0] if len(taxas) else 0.0) * 100:.2f}% a.a"
+        media_anual = np.exp(np.mean(np.log1p(taxas)) * 12) - 1 # Taxa anual constante que produz o mesmo montante que a curva
+        return f"{media_anual * 100:.2f}% a.a (média; {taxas_anuais.min() * 100:.2f}% a {taxas_anuais.max() * 100:.2f}%)"
+
+
+    @staticmethod
+    def criar_tabelas_sensibilidade(sensibilidade, indice_aporte, styles): # Função que monta as tabelas (nominal e real) da grade de sensibilidade, amostrando grades maiores que o espaço da página
+        elementos = []
+        taxas = sensibilidade['Taxas Anuais']
+        prazos = sensibilidade['Prazos (Anos)']
+        linhas = np.unique(np.linspace(0, len(taxas) - 1, min(len(taxas), MAX_LINHAS_TABELA_SENSIBILIDADE)).astype(int))
+        colunas = np.unique(np.linspace(0, len(prazos) - 1, min(len(prazos), MAX_COLUNAS_TABELA_SENSIBILIDADE)).astype(int))
+
+        aporte = sensibilidade['Aportes Mensais'][indice_aporte]
+        texto_aporte = f"R$ {aporte:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+        for titulo, chave in (("Valor Nominal Final", 'Valor Futuro Final'), ("Valor Real Final", 'Valor Futuro Final Real')):
+            valores = sensibilidade[chave][:, :, indice_aporte]
+            dados = [["Taxa / Prazo"] + [f"{prazos[j]} anos" for j in colunas]]
+            for i in linhas:
+                dados.append([f"{taxas[i] * 100:.2f}% a.a".replace(".", ",")] +
+                             [f"R$ {valores[i, j]:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".") for j in colunas])
+
+            largura_coluna = min(80, 470 / len(colunas))
+            tabela = Table(dados, colWidths=[70] + [largura_coluna] * len(colunas))
+            tabela.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0B2E53')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 7),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 5),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ]))
+            elementos.append(Paragraph(f"Análise de Sensibilidade - {titulo} (Aporte Mensal de {texto_aporte})", styles['SectionTitle']))
+            elementos.append(tabela)
+            elementos.append(Spacer(1, 20))
+
+        return elementos
+
+
+
 # Filtrar log's de warnings irrelevantes
 warnings.filterwarnings("ignore", category=UserWarning, message="Pick support for PolyCollection is missing")
 
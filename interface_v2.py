@@ -559,13 +559,13 @@ class PlotagemGrafico: # Classe com as configurações de plotagem do gráfico d
         ax.set_ylabel('Valor') # Título do Eixo Y
 
         # Plotagem das Linhas (com verificação para criação dinâmica da legenda)
-        if patrimonio_mensal and any(patrimonio_mensal):
+        if len(patrimonio_mensal) and np.any(patrimonio_mensal):
             sns.lineplot(x='Meses', y='Valor Nominal com Aporte', data=df_resultados, ax=ax, label='Valor Nominal com Aporte', color='#1E90FF', linestyle='--', linewidth=2) # Azul
         
-        if patrimonio_mensal_sem_aporte and any(patrimonio_mensal_sem_aporte):
+        if len(patrimonio_mensal_sem_aporte) and np.any(patrimonio_mensal_sem_aporte):
             sns.lineplot(x='Meses', y='Valor Real com Aporte', data=df_resultados, ax=ax, label='Valor Real com Aporte', color='#FFFFFF', linestyle='-', linewidth=2) # Branco
         
-        if patrimonio_mensal_real and any(patrimonio_mensal_real):
+        if len(patrimonio_mensal_real) and np.any(patrimonio_mensal_real):
             sns.lineplot(x='Meses', y='Valor Nominal sem Aporte', data=df_resultados, ax=ax, label='Valor Nominal sem Aporte', color='#A6D425', linestyle='--', linewidth=2) # Laranja
         
 
@@ -667,7 +667,7 @@ class PlotagemGraficoPDF:  # Classe com as configurações de plotagem do gráfi
 
         # Plotagem das Linhas no Gráfico (com caixas de anotação para o valor final)
         for nome, serie, cor, estilo in series_info:
-            if serie and any(serie):
+            if len(serie) and np.any(serie):
                 sns.lineplot(x='Meses', y=nome, data=df_resultados_pdf, ax=ax,
                              label=nome, color=cor, linestyle=estilo, linewidth=3.2, legend=False)
 
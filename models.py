@@ -3,13 +3,219 @@
 import pandas as pd
 import numpy as np
 import math
+import threading
+from collections import OrderedDict
+
+
+
+# Tolerância relativa entre a versão vetorizada (forma fechada) e a implementação de referência (laço mês a mês) do valor futuro.
+# As duas versões diferem apenas pela ordem das operações em ponto flutuante; para horizontes de até 100 anos e taxas usuais a diferença fica abaixo deste limite (conferido por verificar_calculos.py)
+TOLERANCIA_RELATIVA = 1e-9
+
+# Tolerância relativa para tratar o reajuste dos aportes igual à capitalização de um degrau (caso particular da anuidade crescente no CronogramaAportes)
+TOLERANCIA_DEGRAU_CRONOGRAMA = 1e-9
+
+# Quantidade de cenários processados por bloco na reconstrução das séries mensais do lote (limita a memória dos arrays temporários)
+TAMANHO_BLOCO_LOTE = 4096
+
+# Quantidade de meses calculados por bloco nas funções de iteração (streaming) da projeção
+MESES_POR_BLOCO_ITERACAO = 120
+
+# Tolerância (em meses) aplicada antes do arredondamento para cima nas soluções fechadas de prazo (NPER)
+TOLERANCIA_NPER = 1e-9
+
+# Limite de meses de usufruto a partir do qual o prazo é tratado como infinito
+LIMITE_MESES_USUFRUTO = 100000
+
+# Limite de meses (1000 anos) a partir do qual um valor futuro desejado é tratado como inatingível
+LIMITE_MESES_VALOR_FUTURO = 1000 * 12
+
+# Campos (colunas) do cronograma de pagamentos das tabelas PRICE e SAC
+DTYPE_TABELA_PAGAMENTOS = np.dtype([
+    ('Mês', np.int64),
+    ('Parcela', np.float64),
+    ('Juros', np.float64),
+    ('Amortização', np.float64),
+    ('Saldo Devedor', np.float64)
+])
+
+# Quantidade máxima de projeções mantidas no cache LRU (as menos usadas recentemente são descartadas primeiro)
+TAMANHO_CACHE_PROJECAO = 64
+
+# Modo EXATO em centavos: a taxa mensal é representada como inteiro em partes por bilhão (ex.: 0,9488793% a.m. -> 9488793)
+ESCALA_TAXA_CENTAVOS = 10 ** 9
+
+# Saldo máximo (em centavos) aceito no modo exato: aportes e juros são comparados com a folga até esse limite ANTES de cada soma, para que nenhuma conta exceda o int64
+LIMITE_SALDO_CENTAVOS = 2 ** 62
+
+# Regras de arredondamento dos juros mensais no modo exato: metade para o par (bancário), metade para cima ou truncamento
+REGRAS_ARREDONDAMENTO = ('meio_par', 'meio_acima', 'truncar')
+
+# Valor das séries em centavos nos meses além do prazo de cada cenário (arrays inteiros não têm NaN)
+CENTAVOS_AUSENTE = -1
+
+# Códigos de erro (bits combináveis) da validação vetorizada dos lotes; zero indica um cenário válido
+ERRO_CAPITAL_NEGATIVO = 1
+ERRO_TAXA_NEGATIVA = 2
+ERRO_PRAZO_NEGATIVO = 4
+ERRO_APORTE_NEGATIVO = 8
+ERRO_DURACAO_NEGATIVA = 16
+ERRO_INFLACAO_INVALIDA = 32
+ERRO_PRAZO_EXCESSIVO = 64
+ERRO_VALOR_NAO_FINITO = 128
+
+# Mensagens de cada código de erro (mesmos textos das validações das funções de cenário único)
+MENSAGENS_ERRO_VALIDACAO = {
+    ERRO_CAPITAL_NEGATIVO: "O capital inicial não pode ser negativo",
+    ERRO_TAXA_NEGATIVA: "A taxa de juros não pode ser negativa",
+    ERRO_PRAZO_NEGATIVO: "O prazo não pode ser negativo",
+    ERRO_APORTE_NEGATIVO: "Aportes devem ser não negativos",
+    ERRO_DURACAO_NEGATIVA: "Durações devem ser não negativas",
+    ERRO_INFLACAO_INVALIDA: "Taxa de inflação inválida (causaria divisão por zero)",
+    ERRO_PRAZO_EXCESSIVO: "O prazo e a taxa levam o valor futuro além do maior número representável",
+    ERRO_VALOR_NAO_FINITO: "Os valores informados devem ser números finitos"
+}
+
+# Maior expoente (log natural) representável em float64: (1 + i)^n estoura quando n * log(1 + i) passa deste valor
+LOG_MAIOR_FLOAT = float(np.log(np.finfo(np.float64).max))
+
+
+
+class CacheProjecao: # Classe com o cache LRU (limitado) dos resultados das funções de projeção, indexado pelos inputs normalizados
+
+    def __init__(self, tamanho_maximo=TAMANHO_CACHE_PROJECAO):
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self._entradas = OrderedDict()
+        self._trava = threading.Lock() # O cache pode ser consultado por mais de uma thread
+
+
+    @staticmethod
+    def normalizar_aportes(aportes_por_periodo): # Função para converter os períodos de aporte em uma tupla imutável (aporte float, duração int) utilizável como chave
+        return tuple((float(aporte), int(duracao)) for aporte, duracao in aportes_por_periodo)
+
+
+    def obter(self, chave): # Função que retorna o resultado armazenado (ou None) e marca a entrada como a mais recentemente usada
+        with self._trava:
+            resultado = self._entradas.get(chave)
+            if resultado is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return resultado
+
+
+    def guardar(self, chave, resultado): # Função que armazena um resultado e descarta as entradas menos usadas recentemente que excedam o tamanho máximo
+        with self._trava:
+            self._entradas[chave] = resultado
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.tamanho_maximo:
+                self._entradas.popitem(last=False)
+
+
+    def redimensionar(self, tamanho_maximo): # Função para alterar o tamanho máximo do cache (zero desativa o armazenamento)
+        if tamanho_maximo < 0:
+            raise ValueError("O tamanho do cache não pode ser negativo")
+        with self._trava:
+            self.tamanho_maximo = tamanho_maximo
+            while len(self._entradas) > self.tamanho_maximo:
+                self._entradas.popitem(last=False)
+
+
+    def limpar(self): # Função para esvaziar o cache e zerar os contadores
+        with self._trava:
+            self._entradas.clear()
+            self.acertos = 0
+            self.falhas = 0
+
+
+    def estatisticas(self): # Função que retorna os contadores de acertos / falhas e a ocupação do cache
+        with self._trava:
+            return {
+                'Acertos': self.acertos,
+                'Falhas': self.falhas,
+                'Entradas': len(self._entradas),
+                'Tamanho Máximo': self.tamanho_maximo
+            }
+
+
+cache_projecao = CacheProjecao() # Instância compartilhada pelas funções de projeção de CalculosProjecao
+estados_incrementais = CacheProjecao(tamanho_maximo=8) # Estados de ProjecaoIncremental reaproveitados entre chamadas com o mesmo capital, taxa e prazo
 
 
 
 class CalculosProjecao: # Classe com as funções para os cálculos da projeção
 
     @staticmethod
-    def valor_futuro_ant(capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses): # Função para o cálculo do VALOR FUTURO no regime ANTECIPADO com APORTES VARIÁVEIS POR PERÍODO
+    def _serie_segmento(valor_inicial, aporte, fator, meses): # Função auxiliar que calcula em forma fechada (série geométrica) a evolução de um SEGMENTO de aporte constante
+        taxa_juros = fator - 1
+
+        if taxa_juros == 0: # Sem juros a série é apenas a soma linear dos aportes
+            return valor_inicial + aporte * np.arange(1, meses + 1, dtype=np.float64)
+
+        # (1 + i)^k - 1 calculado com expm1 / log1p, sem o cancelamento da subtração para taxas pequenas
+        crescimento_menos_um = np.expm1(np.arange(1, meses + 1, dtype=np.float64) * np.log1p(taxa_juros))
+
+        # Valor Futuro de um capital + Série Uniforme Antecipada: V_k = V_0 * (1 + i)^k + A * (1 + i) * ((1 + i)^k - 1) / i
+        return valor_inicial * (crescimento_menos_um + 1) + aporte * fator * crescimento_menos_um / taxa_juros
+
+
+    @staticmethod
+    def valor_futuro_ant(capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses, periodicidade='mensal'): # Função para o cálculo do VALOR FUTURO no regime ANTECIPADO com APORTES VARIÁVEIS POR PERÍODO (versão vetorizada com NumPy; aceita taxa fixa ou curva de taxas mensais, ou anuais com periodicidade='anual')
+        try:
+            if capital_inicial < 0 or np.any(np.asarray(taxa_juros) < 0) or prazo_meses < 0:
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            aportes_por_periodo = CalculosProjecao._periodos_aporte(aportes_por_periodo, prazo_meses)
+            for aporte, duracao in aportes_por_periodo:
+                if aporte < 0 or duracao < 0:
+                    raise ValueError("Aportes e durações devem ser não negativos")
+
+            prazo_meses = int(prazo_meses)
+            if periodicidade != 'mensal':
+                taxa_juros = CalculosProjecao.curva_taxas(taxa_juros, prazo_meses, periodicidade) # Taxas anuais viram a curva mensal equivalente
+            chave = ('valor_futuro_ant', float(capital_inicial), CalculosProjecao._chave_taxas(taxa_juros), CacheProjecao.normalizar_aportes(aportes_por_periodo), prazo_meses)
+            resultado = cache_projecao.obter(chave)
+            if resultado is not None:
+                return resultado
+
+            if np.ndim(taxa_juros):
+                taxas = CalculosProjecao.curva_taxas(taxa_juros, prazo_meses)
+                patrimonio_mensal, _ = CalculosProjecao._acumular_curva(capital_inicial, 1 + taxas, CalculosProjecao.aportes_mensais(aportes_por_periodo, prazo_meses))
+                valor_futuro_total = float(patrimonio_mensal[-1]) if prazo_meses else float(capital_inicial)
+                patrimonio_mensal.flags.writeable = False
+                cache_projecao.guardar(chave, (valor_futuro_total, patrimonio_mensal))
+                return valor_futuro_total, patrimonio_mensal
+
+            fator = 1 + taxa_juros
+            patrimonio_mensal = np.empty(prazo_meses, dtype=np.float64)
+            valor_futuro_total = float(capital_inicial)
+            mes_atual = 0
+
+            # Cada período (aporte, duração) é resolvido em bloco; o período restante sem aportes é tratado como um segmento de aporte zero
+            segmentos = list(aportes_por_periodo) + [(0, prazo_meses)]
+            for aporte, duracao in segmentos:
+                meses = min(int(duracao), prazo_meses - mes_atual)
+                if meses <= 0:
+                    continue
+                serie = CalculosProjecao._serie_segmento(valor_futuro_total, aporte, fator, meses)
+                patrimonio_mensal[mes_atual:mes_atual + meses] = serie
+                valor_futuro_total = float(serie[-1])
+                mes_atual += meses
+
+            patrimonio_mensal.flags.writeable = False # O array fica compartilhado pelo cache e não pode ser alterado pelos consumidores
+            cache_projecao.guardar(chave, (valor_futuro_total, patrimonio_mensal))
+
+            return valor_futuro_total, patrimonio_mensal
+
+        except Exception as e:
+            print(f"Erro no cálculo do valor futuro {e}")
+            return None, np.empty(0)
+
+
+    @staticmethod
+    def valor_futuro_ant_referencia(capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses): # Implementação de REFERÊNCIA (laço mês a mês) do VALOR FUTURO ANTECIPADO, mantida para conferência da versão vetorizada
         try:
             if capital_inicial < 0 or taxa_juros < 0 or prazo_meses < 0:
                 raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
@@ -42,23 +248,348 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
 
 
     @staticmethod
-    def valor_futuro_sem_aportes(capital_inicial, taxa_juros, prazo_meses): # Função para o cálculo do VALOR FUTURO no regime ANTECIPADO e SEM APORTES
+    def _log_expm1(x): # Função auxiliar com log((e^x) - 1) para x > 0, estável tanto para x pequeno (expm1) quanto para x grande (sem calcular e^x)
+        x = np.asarray(x, dtype=np.float64)
+        with np.errstate(divide='ignore', over='ignore'):
+            return np.where(x > 30, x + np.log1p(-np.exp(-x)), np.log(np.expm1(np.minimum(x, 30))))
+
+
+    @staticmethod
+    def meses_checkpoint(prazo_meses, intervalo_checkpoint): # Função que retorna os meses amostrados (a cada 'intervalo' meses), sempre incluindo o último mês do prazo
+        meses = np.arange(intervalo_checkpoint, prazo_meses + 1, intervalo_checkpoint, dtype=np.int64)
+        if prazo_meses > 0 and (len(meses) == 0 or meses[-1] != prazo_meses):
+            meses = np.append(meses, np.int64(prazo_meses))
+        return meses
+
+
+    @staticmethod
+    def valor_futuro_ant_log(capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses, intervalo_checkpoint=1): # Função para o cálculo do VALOR FUTURO ANTECIPADO em ESCALA LOGARÍTMICA, com checkpoints a cada 'intervalo_checkpoint' meses
+        # Retorna (log do valor final, meses amostrados, log do patrimônio nesses meses); sem estouro mesmo quando (1 + i)^n excede o maior float.
+        # Cada segmento é resolvido em forma fechada apenas nos meses amostrados, então a memória é proporcional a prazo / intervalo e o valor final não depende da amostragem
         try:
             if capital_inicial < 0 or taxa_juros < 0 or prazo_meses < 0:
                 raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if int(intervalo_checkpoint) <= 0:
+                raise ValueError("O intervalo entre checkpoints deve ser de pelo menos 1 mês")
+            aportes_por_periodo = CalculosProjecao._periodos_aporte(aportes_por_periodo, prazo_meses)
+            for aporte, duracao in aportes_por_periodo:
+                if aporte < 0 or duracao < 0:
+                    raise ValueError("Aportes e durações devem ser não negativos")
+
+            prazo_meses = int(prazo_meses)
+            meses_amostrados = CalculosProjecao.meses_checkpoint(prazo_meses, int(intervalo_checkpoint))
+            log_patrimonio = np.empty(len(meses_amostrados), dtype=np.float64)
+            log_fator = math.log1p(taxa_juros)
+
+            with np.errstate(divide='ignore'): # log(0) = -inf representa capital ou aporte zero
+                log_valor = np.log(float(capital_inicial))
+                mes_atual = 0
+
+                for aporte, meses in CalculosProjecao._segmentos_truncados(aportes_por_periodo, prazo_meses):
+                    # Meses amostrados dentro do segmento e o próprio fim do segmento (necessário para encadear o próximo)
+                    inicio, fim = np.searchsorted(meses_amostrados, [mes_atual + 1, mes_atual + meses + 1])
+                    decorridos = np.append(meses_amostrados[inicio:fim] - mes_atual, meses).astype(np.float64)
+
+                    # log(V_0 * (1 + i)^k + A * (1 + i) * ((1 + i)^k - 1) / i), somando as duas parcelas com logaddexp
+                    if taxa_juros == 0:
+                        log_anuidade = np.log(decorridos)
+                    else:
+                        log_anuidade = log_fator + CalculosProjecao._log_expm1(decorridos * log_fator) - math.log(taxa_juros)
+                    valores = np.logaddexp(log_valor + decorridos * log_fator, np.log(aporte) + log_anuidade)
+
+                    log_patrimonio[inicio:fim] = valores[:-1]
+                    log_valor = float(valores[-1])
+                    mes_atual += meses
+
+            return log_valor, meses_amostrados, log_patrimonio
+
+        except Exception as e:
+            print(f"Erro no cálculo do valor futuro em escala logarítmica {e}")
+            return None, np.empty(0, dtype=np.int64), np.empty(0)
+
+
+    @staticmethod
+    def valor_futuro_sem_aportes(capital_inicial, taxa_juros, prazo_meses, periodicidade='mensal'): # Função para o cálculo do VALOR FUTURO no regime ANTECIPADO e SEM APORTES (taxa fixa ou curva de taxas mensais, ou anuais com periodicidade='anual')
+        try:
+            if capital_inicial < 0 or np.any(np.asarray(taxa_juros) < 0) or prazo_meses < 0:
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if periodicidade != 'mensal':
+                taxa_juros = CalculosProjecao.curva_taxas(taxa_juros, int(prazo_meses), periodicidade) # Taxas anuais viram a curva mensal equivalente
             
-            patrimonio_mensal = []
-            valor_futuro = capital_inicial
+            chave = ('valor_futuro_sem_aportes', float(capital_inicial), CalculosProjecao._chave_taxas(taxa_juros), int(prazo_meses))
+            resultado = cache_projecao.obter(chave)
+            if resultado is not None:
+                return resultado
 
-            for _ in range(prazo_meses):
-                valor_futuro *= (1 + taxa_juros)
-                patrimonio_mensal.append(valor_futuro)
+            if np.ndim(taxa_juros):
+                patrimonio_mensal = float(capital_inicial) * np.cumprod(1 + CalculosProjecao.curva_taxas(taxa_juros, int(prazo_meses)))
+            else:
+                patrimonio_mensal = CalculosProjecao._serie_segmento(float(capital_inicial), 0, 1 + taxa_juros, int(prazo_meses))
+            valor_futuro = float(patrimonio_mensal[-1]) if len(patrimonio_mensal) else float(capital_inicial)
+
+            patrimonio_mensal.flags.writeable = False
+            cache_projecao.guardar(chave, (valor_futuro, patrimonio_mensal))
         
             return valor_futuro, patrimonio_mensal
         
         except Exception as e:
             print(f"Erro ao calcular valor futuro sem aportes {e}")
-            return None, []
+            return None, np.empty(0)
+
+
+    @staticmethod
+    def valor_futuro_aportes_crescentes(capital_inicial, taxa_juros, cronograma, prazo_meses): # Função para o cálculo do VALOR FUTURO ANTECIPADO com APORTES CRESCENTES (CronogramaAportes), em forma fechada por período
+        try:
+            if capital_inicial < 0 or taxa_juros < 0 or prazo_meses < 0:
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if not isinstance(cronograma, CronogramaAportes):
+                cronograma = CronogramaAportes(cronograma)
+            return cronograma.valor_futuro(capital_inicial, taxa_juros, int(prazo_meses))
+
+        except Exception as e:
+            print(f"Erro no cálculo do valor futuro com aportes crescentes {e}")
+            return None
+
+
+    @staticmethod
+    def valor_futuro_ant_centavos(capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses, regra_arredondamento='meio_par'): # Função para o cálculo EXATO (em centavos inteiros) do VALOR FUTURO ANTECIPADO, com os juros arredondados mês a mês
+        # Retorna (valor final em centavos, patrimônio mensal em centavos int64); os valores de entrada são em reais e convertidos para centavos
+        try:
+            aportes_por_periodo = CalculosProjecao._periodos_aporte(aportes_por_periodo, prazo_meses)
+            aportes = [aporte for aporte, _ in aportes_por_periodo]
+            duracoes = [duracao for _, duracao in aportes_por_periodo]
+
+            resultado = CalculosProjecaoLote.valor_futuro_ant_centavos_lote(capital_inicial, taxa_juros, [aportes], [duracoes], prazo_meses, regra_arredondamento)
+            if resultado is None:
+                return None, np.empty(0, dtype=np.int64)
+
+            return int(resultado['Valor Futuro Final'][0]), resultado['Patrimônio Mensal'][0]
+
+        except Exception as e:
+            print(f"Erro no cálculo do valor futuro em centavos {e}")
+            return None, np.empty(0, dtype=np.int64)
+
+
+    @staticmethod
+    def _periodos_aporte(aportes_por_periodo, prazo_meses): # Função auxiliar que aceita períodos (aporte, duração) ou um CronogramaAportes, retornando sempre os períodos de aporte constante
+        if isinstance(aportes_por_periodo, CronogramaAportes):
+            return aportes_por_periodo.aportes_por_periodo(int(prazo_meses))
+        return aportes_por_periodo
+
+
+    @staticmethod
+    def _segmentos_truncados(aportes_por_periodo, prazo_meses): # Função auxiliar que converte os períodos em segmentos (aporte, meses efetivos) truncados ao prazo, com o período final sem aportes
+        segmentos = []
+        mes_atual = 0
+        for aporte, duracao in aportes_por_periodo:
+            meses = min(int(duracao), prazo_meses - mes_atual)
+            if meses > 0:
+                segmentos.append((float(aporte), meses))
+                mes_atual += meses
+        if mes_atual < prazo_meses:
+            segmentos.append((0.0, prazo_meses - mes_atual))
+        return segmentos
+
+
+    @staticmethod
+    def aportes_mensais(aportes_por_periodo, prazo_meses): # Função que expande os períodos (aporte, duração) no vetor de aportes de cada mês da projeção
+        aportes = np.zeros(prazo_meses, dtype=np.float64)
+        mes_atual = 0
+        for aporte, meses in CalculosProjecao._segmentos_truncados(aportes_por_periodo, prazo_meses):
+            aportes[mes_atual:mes_atual + meses] = aporte
+            mes_atual += meses
+        return aportes
+
+
+    @staticmethod
+    def curva_taxas(taxas, prazo_meses, periodicidade='mensal'): # Função que converte uma taxa fixa ou um vetor de taxas (mensais ou anuais) na curva de taxas MENSAIS de cada mês da projeção
+        if periodicidade not in ('mensal', 'anual'):
+            raise ValueError("A periodicidade das taxas deve ser 'mensal' ou 'anual'")
+
+        taxas = np.asarray(taxas, dtype=np.float64)
+        if periodicidade == 'anual':
+            taxas = np.power(1 + taxas, 1 / 12) - 1 # Taxa mensal equivalente de cada ano
+
+        if taxas.ndim == 0:
+            return np.full(prazo_meses, float(taxas), dtype=np.float64)
+        if taxas.ndim != 1:
+            raise ValueError("A curva de taxas deve ser um vetor")
+
+        if periodicidade == 'anual':
+            taxas = np.repeat(taxas, 12) # Cada taxa anual vale para os 12 meses do ano correspondente
+        if len(taxas) < prazo_meses:
+            raise ValueError(f"A curva de taxas cobre {len(taxas)} meses, menos que o prazo de {prazo_meses} meses")
+        return taxas[:prazo_meses]
+
+
+    @staticmethod
+    def indice_acumulado(taxas, prazo_meses, periodicidade='mensal'): # Função que retorna o ÍNDICE ACUMULADO (produto de 1 + taxa) ao final de cada mês, usado para deflacionar as séries nominais
+        taxas = CalculosProjecao.curva_taxas(taxas, prazo_meses, periodicidade)
+        if np.any(taxas <= -1):
+            raise ValueError("Taxa de inflação inválida (causaria divisão por zero)")
+        return np.cumprod(1 + taxas)
+
+
+    @staticmethod
+    def _chave_taxas(taxas): # Função auxiliar que converte uma taxa fixa ou uma curva de taxas em um valor utilizável na chave do cache
+        if np.ndim(taxas) == 0:
+            return float(taxas)
+        return np.asarray(taxas, dtype=np.float64).tobytes()
+
+
+    @staticmethod
+    def _acumular_curva(capital_inicial, fatores, aportes): # Função auxiliar que evolui o patrimônio (aportes antecipados) com um fator (1 + i) por mês, usando produtos e somas acumuladas
+        # V_k = G_k * (C + soma_{s <= k} A_s / G_{s-1}), com G_k = (1 + i_1) * ... * (1 + i_k) e G_0 = 1
+        crescimento = np.cumprod(fatores)
+        crescimento_anterior = np.empty_like(crescimento)
+        crescimento_anterior[:1] = 1.0
+        crescimento_anterior[1:] = crescimento[:-1]
+
+        patrimonio_sem_aporte = float(capital_inicial) * crescimento
+        patrimonio_mensal = np.cumsum(aportes / crescimento_anterior)
+        patrimonio_mensal += float(capital_inicial)
+        patrimonio_mensal *= crescimento
+        return patrimonio_mensal, patrimonio_sem_aporte
+
+
+    @staticmethod
+    def _estado_incremental(capital_inicial, taxa_juros, prazo_meses): # Função auxiliar que retorna (ou cria) o estado incremental da projeção para um capital, taxa e prazo
+        chave = (float(capital_inicial), float(taxa_juros), int(prazo_meses))
+        estado = estados_incrementais.obter(chave)
+        if estado is None:
+            estado = ProjecaoIncremental(capital_inicial, taxa_juros, prazo_meses)
+            estados_incrementais.guardar(chave, estado)
+        return estado
+
+
+    @staticmethod
+    def projecao_completa(capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses, periodicidade='mensal'): # Função que calcula em uma ÚNICA CHAMADA as curvas NOMINAIS e REAIS (com e sem aportes) e os totais da projeção
+        # Os aportes podem ser períodos (aporte, duração) ou um CronogramaAportes (expandido nos degraus de aporte constante). As taxas podem ser fixas ou curvas (um valor por mês, ou por ano com periodicidade='anual'); as curvas REAIS são as nominais deflacionadas pelo índice de inflação acumulado
+        try:
+            if capital_inicial < 0 or np.any(np.asarray(taxa_juros) < 0) or prazo_meses < 0:
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if np.any(np.asarray(taxa_inflacao) <= -1):
+                raise ValueError("Taxa de inflação inválida (causaria divisão por zero)")
+            aportes_por_periodo = CalculosProjecao._periodos_aporte(aportes_por_periodo, prazo_meses)
+            for aporte, duracao in aportes_por_periodo:
+                if aporte < 0 or duracao < 0:
+                    raise ValueError("Aportes e durações devem ser não negativos")
+
+            prazo_meses = int(prazo_meses)
+            capital_inicial = float(capital_inicial)
+            taxas_fixas = np.ndim(taxa_juros) == 0 and np.ndim(taxa_inflacao) == 0 and periodicidade == 'mensal'
+
+            if taxas_fixas:
+                chave = ('projecao_completa', capital_inicial, float(taxa_juros), float(taxa_inflacao), CacheProjecao.normalizar_aportes(aportes_por_periodo), prazo_meses)
+            else:
+                taxa_juros = CalculosProjecao.curva_taxas(taxa_juros, prazo_meses, periodicidade)
+                taxa_inflacao = CalculosProjecao.curva_taxas(taxa_inflacao, prazo_meses, periodicidade)
+                chave = ('projecao_completa', capital_inicial, taxa_juros.tobytes(), taxa_inflacao.tobytes(), CacheProjecao.normalizar_aportes(aportes_por_periodo), prazo_meses)
+            resultado = cache_projecao.obter(chave)
+            if resultado is not None:
+                return resultado
+
+            if taxas_fixas:
+                taxa_juros_real = ((1 + taxa_juros) / (1 + taxa_inflacao)) - 1
+            else:
+                # Renda perpétua calculada com a taxa real vigente ao final do horizonte (último mês da curva)
+                taxa_juros_real = float((1 + taxa_juros[-1]) / (1 + taxa_inflacao[-1]) - 1) if prazo_meses else np.nan
+                taxa_juros.flags.writeable = False
+                taxa_inflacao.flags.writeable = False
+
+            resultado = ProjecaoResultado(capital_inicial, taxa_juros, taxa_inflacao, taxa_juros_real, aportes_por_periodo, prazo_meses)
+            series = resultado.series
+
+            if taxas_fixas:
+                # Taxa fixa: reaproveita o estado incremental da última projeção com o mesmo capital e prazo (apenas os meses a partir do primeiro período de aporte alterado são recalculados)
+                estado = CalculosProjecao._estado_incremental(capital_inicial, taxa_juros, prazo_meses)
+                estado.calcular(aportes_por_periodo, saida=series[ProjecaoResultado.NOMINAL], saida_sem_aporte=series[ProjecaoResultado.NOMINAL_SEM_APORTE])
+            else:
+                aportes = CalculosProjecao.aportes_mensais(aportes_por_periodo, prazo_meses)
+                series[ProjecaoResultado.NOMINAL], series[ProjecaoResultado.NOMINAL_SEM_APORTE] = CalculosProjecao._acumular_curva(capital_inicial, 1 + taxa_juros, aportes)
+
+            indice_inflacao = CalculosProjecao.indice_acumulado(taxa_inflacao, prazo_meses)
+            np.divide(series[ProjecaoResultado.NOMINAL], indice_inflacao, out=series[ProjecaoResultado.REAL])
+            np.divide(series[ProjecaoResultado.NOMINAL_SEM_APORTE], indice_inflacao, out=series[ProjecaoResultado.REAL_SEM_APORTE])
+
+            segmentos = CalculosProjecao._segmentos_truncados(aportes_por_periodo, prazo_meses)
+            total_aportes = float(sum(aporte * meses for aporte, meses in segmentos))
+            renda_perpetua = CalculosProjecao.renda_perpetua(resultado.valor_futuro_final_real, taxa_juros_real) if not np.isnan(taxa_juros_real) else None
+
+            resultado.totais[ProjecaoResultado.TOTAL_APORTES] = total_aportes
+            resultado.totais[ProjecaoResultado.RENDIMENTO_JUROS] = resultado.valor_futuro_final - capital_inicial - total_aportes
+            resultado.totais[ProjecaoResultado.RENDA_PERPETUA] = np.nan if renda_perpetua is None else renda_perpetua
+
+            resultado.series.flags.writeable = False # O resultado fica compartilhado pelo cache e não pode ser alterado pelos consumidores
+            resultado.totais.flags.writeable = False
+            cache_projecao.guardar(chave, resultado)
+
+            return resultado
+
+        except Exception as e:
+            print(f"Erro no cálculo da projeção: {e}")
+            return None
+
+
+    @staticmethod
+    def _gerar_blocos_projecao(capital_inicial, taxa_juros, taxa_inflacao, segmentos, prazo_meses, meses_por_bloco): # Gerador auxiliar que calcula a projeção bloco a bloco a partir dos valores no início de cada segmento
+        fator = 1 + taxa_juros
+
+        # Valor no início de cada segmento, encadeado em forma fechada (custo proporcional ao número de segmentos, não de meses)
+        inicios, aportes, valores_inicio = [], [], []
+        valor = capital_inicial
+        mes_atual = 0
+        with np.errstate(over='ignore', invalid='ignore'): # Em horizontes extremos os valores além do maior float viram inf, sem interromper a iteração
+            for aporte, meses in segmentos:
+                inicios.append(mes_atual)
+                aportes.append(aporte)
+                valores_inicio.append(valor)
+                valor = float(valor * np.power(fator, meses) + aporte * CalculosProjecaoLote.fator_anuidade(fator, meses))
+                mes_atual += meses
+
+        inicios = np.array(inicios, dtype=np.int64)
+        aportes = np.array(aportes, dtype=np.float64)
+        valores_inicio = np.array(valores_inicio, dtype=np.float64)
+
+        for inicio_bloco in range(0, prazo_meses, meses_por_bloco):
+            mes = np.arange(inicio_bloco + 1, min(inicio_bloco + meses_por_bloco, prazo_meses) + 1, dtype=np.int64)
+            segmento = np.searchsorted(inicios, mes - 1, side='right') - 1 # Segmento vigente em cada mês do bloco
+            decorrido = mes - inicios[segmento]
+
+            with np.errstate(over='ignore', invalid='ignore'):
+                nominal = valores_inicio[segmento] * np.power(fator, decorrido) + aportes[segmento] * CalculosProjecaoLote.fator_anuidade(fator, decorrido)
+                sem_aporte = capital_inicial * np.power(fator, mes)
+                real = nominal / np.power(1 + taxa_inflacao, mes) # Deflacionado pelo índice de inflação acumulado
+
+            yield mes, nominal, sem_aporte, real
+
+
+    @staticmethod
+    def iterar_projecao_blocos(capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses, meses_por_bloco=MESES_POR_BLOCO_ITERACAO): # Função que retorna um iterador de BLOCOS de meses (arrays mes, nominal, sem_aporte, real) da projeção, sem materializar as séries inteiras
+        try:
+            if capital_inicial < 0 or taxa_juros < 0 or prazo_meses < 0:
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if taxa_inflacao <= -1:
+                raise ValueError("Taxa de inflação inválida (causaria divisão por zero)")
+            if int(meses_por_bloco) <= 0:
+                raise ValueError("O bloco deve ter pelo menos 1 mês")
+            aportes_por_periodo = CalculosProjecao._periodos_aporte(aportes_por_periodo, prazo_meses)
+            for aporte, duracao in aportes_por_periodo:
+                if aporte < 0 or duracao < 0:
+                    raise ValueError("Aportes e durações devem ser não negativos")
+
+            segmentos = CalculosProjecao._segmentos_truncados(aportes_por_periodo, int(prazo_meses))
+            return CalculosProjecao._gerar_blocos_projecao(float(capital_inicial), taxa_juros, taxa_inflacao, segmentos, int(prazo_meses), int(meses_por_bloco))
+
+        except Exception as e:
+            print(f"Erro na iteração da projeção: {e}")
+            return iter(())
+
+
+    @staticmethod
+    def iterar_projecao(capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses): # Função que retorna um iterador de LINHAS (mes, nominal, sem_aporte, real) da projeção, calculadas sob demanda em blocos
+        for mes, nominal, sem_aporte, real in CalculosProjecao.iterar_projecao_blocos(capital_inicial, taxa_juros, taxa_inflacao, aportes_por_periodo, prazo_meses):
+            yield from zip(mes.tolist(), nominal.tolist(), sem_aporte.tolist(), real.tolist())
 
 
     @staticmethod
@@ -123,7 +654,10 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
             if valor_futuro_desejado <= 0 or taxa_juros_real <= 0 or prazo_meses <= 0:
                 raise ValueError("Valor futuro, taxa de juros e prazo devem ser positivos")
             
-            aporte = (valor_futuro_desejado * taxa_juros_real) / (((1 + taxa_juros_real) ** prazo_meses - 1) * (1 + taxa_juros_real)) # Aporte Periódico Constante e Antecipado
+            # Aporte Periódico Constante e Antecipado: A = VF * i / (((1 + i)^n - 1) * (1 + i)), calculado em escala logarítmica para não estourar em prazos longos / taxas altas
+            log_aporte = (math.log(valor_futuro_desejado) + math.log(taxa_juros_real) - math.log1p(taxa_juros_real)
+                          - float(CalculosProjecao._log_expm1(prazo_meses * math.log1p(taxa_juros_real))))
+            aporte = math.exp(log_aporte) # Tende a zero (sem estouro) quando (1 + i)^n excede o maior float
             return aporte
         
         except Exception as e:
@@ -159,31 +693,50 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
             return None
 
 
+    @staticmethod
+    def _meses_usufruto(patrimonio_inicial, retirada_mensal, taxa_juros_real): # Função auxiliar (vetorizada) com a solução fechada (NPER) do número de meses até o patrimônio se esgotar
+        patrimonio_inicial, retirada_mensal, taxa_juros_real = np.broadcast_arrays(
+            np.asarray(patrimonio_inicial, dtype=np.float64), np.asarray(retirada_mensal, dtype=np.float64), np.asarray(taxa_juros_real, dtype=np.float64))
+
+        # Com retirada antecipada, P_n = P* + (1 + i)^n * (P_0 - P*), onde P* = W * (1 + i) / i é o patrimônio que se mantém constante
+        sem_juros = taxa_juros_real == 0
+        taxa_segura = np.where(sem_juros, 1.0, taxa_juros_real)
+        patrimonio_estavel = retirada_mensal * (1 + taxa_juros_real) / taxa_segura
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # P_n <= 0  <=>  n >= ln(P* / (P* - P_0)) / ln(1 + i); sem juros, n >= P_0 / W
+            meses_continuos = np.where(sem_juros, patrimonio_inicial / retirada_mensal,
+                                       np.log(patrimonio_estavel / (patrimonio_estavel - patrimonio_inicial)) / np.log1p(taxa_segura))
+            meses = np.ceil(meses_continuos - TOLERANCIA_NPER) # Tolerância evita um mês extra por arredondamento quando o esgotamento é exato
+
+        esgota = sem_juros | (patrimonio_inicial < patrimonio_estavel)
+        return np.where(esgota, np.maximum(meses, 1), np.inf)
+
+
+    @staticmethod
+    def curva_usufruto(patrimonio_inicial, retirada_mensal, taxa_juros_real, meses): # Função que gera em uma única expressão vetorizada a curva de DECAIMENTO do patrimônio (mês 0 até 'meses')
+        n = np.arange(meses + 1, dtype=np.float64)
+        if taxa_juros_real == 0:
+            curva = patrimonio_inicial - retirada_mensal * n
+        else:
+            patrimonio_estavel = retirada_mensal * (1 + taxa_juros_real) / taxa_juros_real
+            curva = patrimonio_estavel + np.power(1 + taxa_juros_real, n) * (patrimonio_inicial - patrimonio_estavel)
+        return np.maximum(curva, 0) # Quando o patrimônio é zerado, o último ponto da curva é 0
+
+
     @staticmethod
     def tempo_usufruto(patrimonio_inicial, retirada_mensal, taxa_juros_real): # Função para o cálculo do TEMPO DE USUFRUTO de um PATRIMÔNIO ACUMULADO com RETIRADAS MENSAIS
         try:
             if patrimonio_inicial <= 0 or retirada_mensal <= 0 or taxa_juros_real < 0:
                 raise ValueError("Patrimônio inicial, retirada mensal ou taxa de juros não podem ser negativos")
 
-            patrimonio_historico = [] # Lista para armazenar a evolução do patrimônio (para o gráfico do decaimento)
-
-            if patrimonio_inicial * taxa_juros_real >= retirada_mensal:
-                return float('inf'), None, None  # Casos onde o rendimento do capital cobre completamente o valor da retirada
+            meses = float(CalculosProjecao._meses_usufruto(patrimonio_inicial, retirada_mensal, taxa_juros_real))
 
-            meses = 0
-            patrimonio = patrimonio_inicial
-            patrimonio_historico.append({'Mês': meses, 'Patrimônio': patrimonio}) 
+            if meses > LIMITE_MESES_USUFRUTO: # Casos onde o rendimento do capital cobre a retirada (ou o prazo excede o limite) são tratados como infinito
+                return float('inf'), None, None, np.empty(0)
 
-            patrimonio = (patrimonio - retirada_mensal) * (1 + taxa_juros_real) # Calcula a retirada mensal e considera a rentabilidade do patrimônio restante
-            meses += 1
-
-            if patrimonio > 0: # Enquanto o patrimônio não for zerado, adicionar o valor restante no histórico
-                patrimonio_historico.append({'Mês': meses, 'Patrimônio': patrimonio}) 
-            else:
-                patrimonio_historico.append({'Mês': meses, 'Patrimônio': 0}) # Quando o patrimônio for zerado, adiciona 0 para finalizar
-
-            if meses > 100000:  # Limite para evitar loops muito longos
-                return float('inf'), None, None, []  # Trata como infinito se exceder o limite e retorna lista vazia
+            meses = int(meses)
+            patrimonio_historico = CalculosProjecao.curva_usufruto(patrimonio_inicial, retirada_mensal, taxa_juros_real, meses) # Evolução do patrimônio (para o gráfico do decaimento)
 
             anos = meses // 12
             meses_restantes = meses % 12
@@ -192,11 +745,32 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
 
         except Exception as e:
             print(f"Erro no cálculo do tempo de usufruto: {e}")
-            return None, None, None, []
+            return None, None, None, np.empty(0)
+
+
+    @staticmethod
+    def _tabela_colunar(meses, parcela, juros, amortizacao, saldo_devedor): # Função auxiliar que monta o array estruturado (uma coluna por campo) do cronograma de pagamentos
+        tabela = np.empty(len(meses), dtype=DTYPE_TABELA_PAGAMENTOS)
+        tabela['Mês'] = meses
+        tabela['Parcela'] = parcela
+        tabela['Juros'] = juros
+        tabela['Amortização'] = amortizacao
+        tabela['Saldo Devedor'] = saldo_devedor
+        return tabela
 
 
     @staticmethod
-    def tabela_price(valor_total, taxa, prazo_meses, entrada=0): # Cálculo da TABELA de CRONOGRAMA de PAGAMENTOS de um FINANCIAMENTO feito no SISTEMA PRICE
+    def tabela_como_lista(resultado): # Adaptador que converte o resultado colunar no formato anterior (lista de dicionários por mês)
+        resultado = dict(resultado)
+        resultado['Tabela de Pagamentos'] = [
+            {campo: (int(linha[campo]) if campo == 'Mês' else float(linha[campo])) for campo in DTYPE_TABELA_PAGAMENTOS.names}
+            for linha in resultado['Tabela de Pagamentos']
+        ]
+        return resultado
+
+
+    @staticmethod
+    def tabela_price_colunar(valor_total, taxa, prazo_meses, entrada=0): # Cálculo vetorizado da TABELA de PAGAMENTOS no SISTEMA PRICE (cronograma como array estruturado)
         try:
             if valor_total <= 0 or taxa < 0 or prazo_meses <= 0 or entrada < 0 or entrada > valor_total:
                 raise ValueError("Verifque os valores inputados")
@@ -207,41 +781,28 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
             if valor_financiado <= 0:
                 raise ValueError("O valor financiado é menor do que zero")
 
+            meses = np.arange(1, prazo_meses + 1)
+
             if taxa == 0:
                 parcela = valor_financiado / prazo_meses
+                saldo_devedor = valor_financiado - parcela * meses
             else:
                 parcela = valor_financiado * (taxa * (1 + taxa) ** prazo_meses) / ((1 + taxa) ** prazo_meses - 1) # Parcela Constante
-            
-            saldo_devedor = valor_financiado
-            tabela = []
-            
-            
-            for mes in range(1, prazo_meses + 1):
-                juros = saldo_devedor * taxa
-                amortizacao = parcela - juros
-                saldo_devedor -= amortizacao
-                
-                
-                if saldo_devedor < 0:
-                    saldo_devedor = 0
-                
-                tabela.append({
-                    'Mês': mes,
-                    'Parcela': parcela,
-                    'Juros': juros,
-                    'Amortização': amortizacao,
-                    'Saldo Devedor': saldo_devedor
-                })
-            
-            
-            total_juros = sum(entry['Juros'] for entry in tabela)
-            total_parcelas = sum(entry['Parcela'] for entry in tabela)
+                crescimento = np.power(1 + taxa, meses.astype(np.float64))
+                saldo_devedor = valor_financiado * crescimento - parcela * (crescimento - 1) / taxa # Saldo após k parcelas: PV * (1 + i)^k - PMT * ((1 + i)^k - 1) / i
+
+            saldo_anterior = np.concatenate(([valor_financiado], saldo_devedor[:-1]))
+            juros = saldo_anterior * taxa
+            amortizacao = parcela - juros
+            saldo_devedor = np.maximum(saldo_devedor, 0)
+
+            parcelas = np.full(prazo_meses, parcela)
             
             return {
                 'Valor Financiado': valor_financiado,
-                'Tabela de Pagamentos': tabela,
-                'Total em Juros': total_juros,
-                'Total em Pagamentos': total_parcelas,
+                'Tabela de Pagamentos': CalculosProjecao._tabela_colunar(meses, parcelas, juros, amortizacao, saldo_devedor),
+                'Total em Juros': float(juros.sum()),
+                'Total em Pagamentos': float(parcelas.sum()),
                 'Entrada': entrada
             }
         
@@ -250,7 +811,7 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
 
 
     @staticmethod
-    def tabela_sac(valor_total, taxa, prazo_meses, entrada=0): # Cálculo da TABELA de CRONOGRAMA de PAGAMENTOS de um FINANCIAMENTO feito no SISTEMA SAC
+    def tabela_sac_colunar(valor_total, taxa, prazo_meses, entrada=0): # Cálculo vetorizado da TABELA de PAGAMENTOS no SISTEMA SAC (cronograma como array estruturado)
 
         try:
             if valor_total <= 0 or taxa < 0 or prazo_meses <= 0 or entrada < 0 or entrada > valor_total:
@@ -262,37 +823,20 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
             if valor_financiado <= 0:
                 raise ValueError("O valor financiado é menor do zero")
 
+            meses = np.arange(1, prazo_meses + 1)
             amortizacao = valor_financiado / prazo_meses # Amortização Constante
-            saldo_devedor = valor_financiado
-            tabela = []
-            
-            
-            for mes in range(1, prazo_meses + 1):
-                juros = saldo_devedor * taxa
-                parcela = amortizacao + juros
-                saldo_devedor -= amortizacao
-                
-                
-                if saldo_devedor < 0:
-                    saldo_devedor = 0
-                
-                tabela.append({
-                    'Mês': mes,
-                    'Parcela': parcela,
-                    'Juros': juros,
-                    'Amortização': amortizacao,
-                    'Saldo Devedor': saldo_devedor
-                })
-            
+
+            saldo_anterior = valor_financiado - amortizacao * (meses - 1)
+            juros = saldo_anterior * taxa
+            parcela = amortizacao + juros
+            saldo_devedor = np.maximum(saldo_anterior - amortizacao, 0)
+
             # Cálculo dos Totais
-            total_juros = sum(entry['Juros'] for entry in tabela)
-            total_parcelas = sum(entry['Parcela'] for entry in tabela)
-            
             return {
                 'Valor Financiado': valor_financiado,
-                'Tabela de Pagamentos': tabela,
-                'Total em Juros': total_juros,
-                'Total em Pagamentos': total_parcelas,
+                'Tabela de Pagamentos': CalculosProjecao._tabela_colunar(meses, parcela, juros, np.full(prazo_meses, amortizacao), saldo_devedor),
+                'Total em Juros': float(juros.sum()),
+                'Total em Pagamentos': float(parcela.sum()),
                 'Entrada': entrada
             }
         
@@ -300,6 +844,36 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
             raise ValueError(f"Ocorreu um erro inesperado: {str(e)}")
 
 
+    @staticmethod
+    def tabela_price(valor_total, taxa, prazo_meses, entrada=0): # Cálculo da TABELA de CRONOGRAMA de PAGAMENTOS de um FINANCIAMENTO feito no SISTEMA PRICE (formato de lista de dicionários)
+        return CalculosProjecao.tabela_como_lista(CalculosProjecao.tabela_price_colunar(valor_total, taxa, prazo_meses, entrada))
+
+
+    @staticmethod
+    def tabela_sac(valor_total, taxa, prazo_meses, entrada=0): # Cálculo da TABELA de CRONOGRAMA de PAGAMENTOS de um FINANCIAMENTO feito no SISTEMA SAC (formato de lista de dicionários)
+        return CalculosProjecao.tabela_como_lista(CalculosProjecao.tabela_sac_colunar(valor_total, taxa, prazo_meses, entrada))
+
+
+    @staticmethod
+    def _meses_para_valor_futuro(capital_inicial, aporte_mensal, taxa_juros, valor_futuro_desejado): # Função auxiliar (vetorizada) com a solução fechada (NPER) do prazo para atingir um valor futuro com aportes antecipados
+        capital_inicial, aporte_mensal, taxa_juros, valor_futuro_desejado = np.broadcast_arrays(
+            np.asarray(capital_inicial, dtype=np.float64), np.asarray(aporte_mensal, dtype=np.float64),
+            np.asarray(taxa_juros, dtype=np.float64), np.asarray(valor_futuro_desejado, dtype=np.float64))
+
+        # V_n = (C + K) * (1 + i)^n - K, com K = A * (1 + i) / i  =>  n = ln((VF + K) / (C + K)) / ln(1 + i); sem juros, n = (VF - C) / A
+        sem_juros = taxa_juros == 0
+        taxa_segura = np.where(sem_juros, 1.0, taxa_juros)
+        k = aporte_mensal * (1 + taxa_juros) / taxa_segura
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            meses_continuos = np.where(sem_juros, (valor_futuro_desejado - capital_inicial) / aporte_mensal,
+                                       np.log((valor_futuro_desejado + k) / (capital_inicial + k)) / np.log1p(taxa_segura))
+            meses = np.ceil(meses_continuos - TOLERANCIA_NPER)
+
+        meses = np.where(np.isnan(meses), np.inf, meses) # Sem capital, sem aportes (0 / 0) o valor nunca é atingido
+        return np.where(capital_inicial >= valor_futuro_desejado, 0, meses)
+
+
     @staticmethod
     def prazo_para_valor_futuro(capital_inicial, aporte_mensal, taxa_juros, valor_futuro_desejado): # Cálculo do PRAZO NECESSÁRIO para atingir um VALOR FUTURO COM APORTES
 
@@ -309,31 +883,745 @@ class CalculosProjecao: # Classe com as funções para os cálculos da projeçã
             if capital_inicial >= valor_futuro_desejado:
                 return 0
 
-            meses = 0
-            patrimonio_atual = capital_inicial
+            meses = float(CalculosProjecao._meses_para_valor_futuro(capital_inicial, aporte_mensal, taxa_juros, valor_futuro_desejado))
 
-            if taxa_juros == 0: # Caso o juro seja zero, retorna 0, pois o valor nunca será rentabilizado
-                if aporte_mensal == 0:
-                    return float('inf')
-                if patrimonio_atual < valor_futuro_desejado:
-                    diferenca = valor_futuro_desejado - patrimonio_atual
-                    meses = math.ceil(diferenca / aporte_mensal)
-                    return int(meses)
-                else:
-                    return 0
+            if taxa_juros == 0: # Sem juros o prazo depende apenas dos aportes (sem limite de meses)
+                return float('inf') if meses == float('inf') else int(meses)
 
-            max_meses = 1000 * 12 # Limite para evitar loops infinitos
-            
-            while patrimonio_atual < valor_futuro_desejado and meses < max_meses: # Retorna o prazo em meses
-                patrimonio_atual = (patrimonio_atual + aporte_mensal) * (1 + taxa_juros)
-                meses += 1
-            anos = meses / 12 # Retorna o prazo em anos
-            
-            if patrimonio_atual < valor_futuro_desejado:
+            if meses > LIMITE_MESES_VALOR_FUTURO: # Prazos acima do limite são tratados como inatingíveis
                 return float('inf')
-            
-            else:
-                return meses, anos
+
+            meses = int(meses)
+            anos = meses / 12 # Retorna o prazo em anos
+
+            return meses, anos
 
         except Exception as e:
             raise ValueError(f"Ocorreu um erro inesperado: {str(e)}")
+
+
+
+
+class ProjecaoResultado: # Classe compacta com os resultados de uma projeção (séries e totais em arrays float64 contíguos, sem listas de floats)
+
+    # Índices das linhas da matriz de séries (curva x mês)
+    NOMINAL, NOMINAL_SEM_APORTE, REAL, REAL_SEM_APORTE = range(4)
+
+    # Índices do vetor de totais
+    TOTAL_APORTES, RENDIMENTO_JUROS, RENDA_PERPETUA = range(3)
+
+    __slots__ = ('capital_inicial', 'taxa_juros', 'taxa_inflacao', 'taxa_juros_real', 'aportes_por_periodo', 'prazo_meses', 'series', 'totais')
+
+    def __init__(self, capital_inicial, taxa_juros, taxa_inflacao, taxa_juros_real, aportes_por_periodo, prazo_meses):
+        # Parâmetros de entrada da projeção (taxas mensais fixas ou curvas mensais, e aportes em meses)
+        self.capital_inicial = capital_inicial
+        self.taxa_juros = taxa_juros
+        self.taxa_inflacao = taxa_inflacao
+        self.taxa_juros_real = taxa_juros_real
+        self.aportes_por_periodo = tuple(aportes_por_periodo)
+        self.prazo_meses = prazo_meses
+
+        self.series = np.empty((4, prazo_meses), dtype=np.float64) # Uma linha por curva, um valor por mês
+        self.totais = np.full(3, np.nan, dtype=np.float64)
+
+
+    def _valor_final(self, linha): # Função auxiliar que retorna o último valor de uma curva (ou o capital inicial em projeções de prazo zero)
+        return float(self.series[linha, -1]) if self.prazo_meses else self.capital_inicial
+
+
+    # Acessores das séries mensais (visões das linhas da matriz, sem cópia)
+    @property
+    def meses(self):
+        return np.arange(1, self.prazo_meses + 1)
+
+    @property
+    def patrimonio_mensal(self):
+        return self.series[ProjecaoResultado.NOMINAL]
+
+    @property
+    def patrimonio_mensal_sem_aporte(self):
+        return self.series[ProjecaoResultado.NOMINAL_SEM_APORTE]
+
+    @property
+    def patrimonio_mensal_real(self):
+        return self.series[ProjecaoResultado.REAL]
+
+    @property
+    def patrimonio_mensal_sem_aporte_real(self):
+        return self.series[ProjecaoResultado.REAL_SEM_APORTE]
+
+
+    # Acessores dos valores finais e totais
+    @property
+    def valor_futuro_final(self):
+        return self._valor_final(ProjecaoResultado.NOMINAL)
+
+    @property
+    def valor_futuro_sem_aporte_final(self):
+        return self._valor_final(ProjecaoResultado.NOMINAL_SEM_APORTE)
+
+    @property
+    def valor_futuro_final_real(self):
+        return self._valor_final(ProjecaoResultado.REAL)
+
+    @property
+    def valor_futuro_sem_aporte_final_real(self):
+        return self._valor_final(ProjecaoResultado.REAL_SEM_APORTE)
+
+    @property
+    def total_aportes(self):
+        return float(self.totais[ProjecaoResultado.TOTAL_APORTES])
+
+    @property
+    def rendimento_juros(self):
+        return float(self.totais[ProjecaoResultado.RENDIMENTO_JUROS])
+
+    @property
+    def renda_perpetua(self): # Retorna None quando a renda perpétua não pode ser calculada (taxa real ou valor final não positivos), como em CalculosProjecao.renda_perpetua
+        renda_perpetua = self.totais[ProjecaoResultado.RENDA_PERPETUA]
+        return None if np.isnan(renda_perpetua) else float(renda_perpetua)
+
+
+
+
+class ProjecaoIncremental: # Classe que mantém checkpoints por fronteira de período de aporte, recalculando a projeção apenas a partir do primeiro período alterado
+
+    def __init__(self, capital_inicial, taxa_juros, prazo_meses):
+        self.capital_inicial = float(capital_inicial)
+        self.taxa_juros = taxa_juros
+        self.prazo_meses = int(prazo_meses)
+        self.fator = 1 + taxa_juros
+
+        # Tabela (1 + i)^k e curva sem aportes: não dependem dos aportes e são calculadas uma única vez
+        self.crescimento = np.power(self.fator, np.arange(1, self.prazo_meses + 1, dtype=np.float64))
+        self.patrimonio_sem_aporte = self.capital_inicial * self.crescimento
+        self.patrimonio_mensal = np.empty(self.prazo_meses, dtype=np.float64)
+
+        self.segmentos = [] # Segmentos (aporte, meses) já calculados
+        self.checkpoints = [0.0] # Parcela acumulada dos aportes no início de cada segmento (e ao final do último)
+        self.meses_recalculados = 0 # Quantidade de meses recalculados na última chamada
+        self._trava = threading.Lock()
+
+
+    def calcular(self, aportes_por_periodo, saida=None, saida_sem_aporte=None): # Função que atualiza a projeção para novos períodos de aporte e retorna (valor futuro final, patrimônio mensal)
+        segmentos = CalculosProjecao._segmentos_truncados(aportes_por_periodo, self.prazo_meses)
+
+        with self._trava:
+            # Primeiro segmento que difere da última projeção calculada; o prefixo anterior a ele é reaproveitado
+            primeiro_alterado = 0
+            limite = min(len(segmentos), len(self.segmentos))
+            while primeiro_alterado < limite and segmentos[primeiro_alterado] == self.segmentos[primeiro_alterado]:
+                primeiro_alterado += 1
+
+            mes_atual = sum(meses for _, meses in segmentos[:primeiro_alterado])
+            self.meses_recalculados = self.prazo_meses - mes_atual
+            acumulado_aportes = self.checkpoints[primeiro_alterado]
+            del self.checkpoints[primeiro_alterado + 1:]
+            taxa_juros = self.fator - 1
+
+            for aporte, meses in segmentos[primeiro_alterado:]:
+                crescimento_local = self.crescimento[:meses] # (1 + i)^k do início do segmento até o mês k
+                if taxa_juros == 0:
+                    parcela = acumulado_aportes + aporte * np.arange(1, meses + 1, dtype=np.float64)
+                else:
+                    parcela = acumulado_aportes * crescimento_local + aporte * self.fator * (crescimento_local - 1) / taxa_juros
+                np.add(self.patrimonio_sem_aporte[mes_atual:mes_atual + meses], parcela, out=self.patrimonio_mensal[mes_atual:mes_atual + meses])
+                acumulado_aportes = float(parcela[-1])
+                self.checkpoints.append(acumulado_aportes)
+                mes_atual += meses
+
+            self.segmentos = segmentos
+            valor_futuro_total = float(self.patrimonio_mensal[-1]) if self.prazo_meses else self.capital_inicial
+
+            # As cópias para os arrays de saída são feitas com a trava adquirida, antes que outra chamada altere o buffer interno
+            if saida is not None:
+                np.copyto(saida, self.patrimonio_mensal)
+            if saida_sem_aporte is not None:
+                np.copyto(saida_sem_aporte, self.patrimonio_sem_aporte)
+
+            return valor_futuro_total, self.patrimonio_mensal
+
+
+
+
+class CronogramaAportes: # Classe com o cronograma de aportes CRESCENTES: cada período tem aporte inicial, duração, taxa de reajuste e frequência (em meses) do reajuste
+
+    __slots__ = ('periodos',)
+
+    def __init__(self, periodos):
+        # Cada período é (aporte inicial, duração em meses[, taxa de reajuste por degrau[, meses entre reajustes]]); sem reajuste, o aporte é fixo como em aportes_por_periodo
+        normalizados = []
+        for periodo in periodos:
+            aporte, duracao = periodo[0], periodo[1]
+            taxa_reajuste = periodo[2] if len(periodo) > 2 else 0.0
+            meses_reajuste = periodo[3] if len(periodo) > 3 else 12
+            if aporte < 0 or duracao < 0:
+                raise ValueError("Aportes e durações devem ser não negativos")
+            if taxa_reajuste <= -1:
+                raise ValueError("A taxa de reajuste dos aportes deve ser maior que -100%")
+            if int(meses_reajuste) <= 0:
+                raise ValueError("A frequência de reajuste dos aportes deve ser de pelo menos 1 mês")
+            normalizados.append((float(aporte), int(duracao), float(taxa_reajuste), int(meses_reajuste)))
+        self.periodos = tuple(normalizados)
+
+
+    @classmethod
+    def reajuste_anual(cls, aportes_por_periodo, taxa_reajuste): # Função que cria o cronograma a partir de períodos (aporte, duração) com o mesmo reajuste anual em todos eles (ex.: inflação ou crescimento salarial)
+        return cls([(aporte, duracao, taxa_reajuste, 12) for aporte, duracao in aportes_por_periodo])
+
+
+    def _periodos_truncados(self, prazo_meses): # Função auxiliar que trunca os períodos ao prazo da projeção, retornando (aporte, meses efetivos, taxa de reajuste, meses entre reajustes)
+        truncados = []
+        mes_atual = 0
+        for aporte, duracao, taxa_reajuste, meses_reajuste in self.periodos:
+            meses = min(duracao, prazo_meses - mes_atual)
+            if meses > 0:
+                truncados.append((aporte, meses, taxa_reajuste, meses_reajuste))
+                mes_atual += meses
+        return truncados
+
+
+    def aportes_por_periodo(self, prazo_meses): # Função que expande o cronograma nos degraus de aporte constante (aporte, duração), no formato aceito pelas demais funções de projeção
+        degraus = []
+        for aporte, meses, taxa_reajuste, meses_reajuste in self._periodos_truncados(prazo_meses):
+            for inicio in range(0, meses, meses_reajuste):
+                degraus.append((aporte * (1 + taxa_reajuste) ** (inicio // meses_reajuste), min(meses_reajuste, meses - inicio)))
+        return degraus
+
+
+    def total_aportes(self, prazo_meses): # Função que soma em forma fechada (série geométrica dos degraus) o total aportado até o prazo
+        total = 0.0
+        for aporte, meses, taxa_reajuste, meses_reajuste in self._periodos_truncados(prazo_meses):
+            degraus_completos, meses_restantes = divmod(meses, meses_reajuste)
+            crescimento = 1 + taxa_reajuste
+            soma_degraus = degraus_completos if taxa_reajuste == 0 else (crescimento ** degraus_completos - 1) / taxa_reajuste
+            total += aporte * (meses_reajuste * soma_degraus + meses_restantes * crescimento ** degraus_completos)
+        return total
+
+
+    def valor_futuro(self, capital_inicial, taxa_juros, prazo_meses): # Função que calcula o VALOR FUTURO ANTECIPADO em forma fechada (anuidade crescente), com custo proporcional ao número de períodos e não ao de meses
+        fator = 1 + taxa_juros
+        valor = float(capital_inicial)
+        mes_atual = 0
+        for aporte, meses, taxa_reajuste, meses_reajuste in self._periodos_truncados(prazo_meses):
+            degraus_completos, meses_restantes = divmod(meses, meses_reajuste)
+            crescimento = 1 + taxa_reajuste
+            fator_degrau = fator ** meses_reajuste # Capitalização de um degrau inteiro
+
+            # Soma de crescimento^j * fator_degrau^(q - 1 - j), j = 0..q-1 (anuidade crescente), com o caso crescimento == fator_degrau tratado à parte
+            if abs(fator_degrau - crescimento) <= TOLERANCIA_DEGRAU_CRONOGRAMA * fator_degrau:
+                soma_degraus = degraus_completos * fator_degrau ** (degraus_completos - 1) if degraus_completos else 0.0
+            else:
+                soma_degraus = (fator_degrau ** degraus_completos - crescimento ** degraus_completos) / (fator_degrau - crescimento)
+
+            valor_degraus = aporte * float(CalculosProjecaoLote.fator_anuidade(fator, meses_reajuste)) * soma_degraus
+            valor_resto = aporte * crescimento ** degraus_completos * float(CalculosProjecaoLote.fator_anuidade(fator, meses_restantes))
+            valor = valor * fator ** meses + valor_degraus * fator ** meses_restantes + valor_resto
+            mes_atual += meses
+
+        return valor * fator ** (prazo_meses - mes_atual) # Período final sem aportes
+
+
+
+
+class CalculosProjecaoLote: # Classe com as funções para o cálculo de VÁRIOS CENÁRIOS de projeção em uma única chamada (vetorizado sobre os cenários)
+
+    @staticmethod
+    def _preparar_entradas(capitais, taxas_juros, aportes, duracoes, prazos_meses): # Função auxiliar para converter os inputs do lote em arrays NumPy com formatos compatíveis
+        capitais = np.atleast_1d(np.asarray(capitais, dtype=np.float64))
+        quantidade = capitais.shape[0]
+
+        taxas_juros = np.broadcast_to(np.asarray(taxas_juros, dtype=np.float64), (quantidade,))
+        prazos_meses = np.broadcast_to(np.asarray(prazos_meses, dtype=np.int64), (quantidade,))
+
+        # Cronogramas de aporte preenchidos (padded) com zeros: uma linha por cenário e uma coluna por período
+        aportes = np.asarray(aportes, dtype=np.float64).reshape(quantidade, -1) if np.size(aportes) else np.zeros((quantidade, 0))
+        duracoes = np.asarray(duracoes, dtype=np.int64).reshape(quantidade, -1) if np.size(duracoes) else np.zeros((quantidade, 0), dtype=np.int64)
+        if aportes.shape != duracoes.shape:
+            raise ValueError("Os cronogramas de aportes e de durações devem ter o mesmo formato")
+
+        return capitais, taxas_juros, aportes, duracoes, prazos_meses
+
+
+    @staticmethod
+    def validar_lote(capitais, taxas_juros, aportes, duracoes, prazos_meses, taxas_inflacao=None): # Função que valida um LOTE de cenários com máscaras vetorizadas, retornando um código de erro (bits) por cenário em vez de lançar exceções
+        capitais, taxas_juros, aportes, duracoes, prazos_meses = CalculosProjecaoLote._preparar_entradas(capitais, taxas_juros, aportes, duracoes, prazos_meses)
+        codigos = np.zeros(capitais.shape[0], dtype=np.int64)
+
+        with np.errstate(invalid='ignore'): # Comparações com NaN são falsas; os valores não finitos têm o próprio código
+            codigos |= np.where(capitais < 0, ERRO_CAPITAL_NEGATIVO, 0)
+            codigos |= np.where(taxas_juros < 0, ERRO_TAXA_NEGATIVA, 0)
+            codigos |= np.where(prazos_meses < 0, ERRO_PRAZO_NEGATIVO, 0)
+            codigos |= np.where(np.any(aportes < 0, axis=1), ERRO_APORTE_NEGATIVO, 0)
+            codigos |= np.where(np.any(duracoes < 0, axis=1), ERRO_DURACAO_NEGATIVA, 0)
+            codigos |= np.where(~np.isfinite(capitais) | ~np.isfinite(taxas_juros) | ~np.all(np.isfinite(aportes), axis=1), ERRO_VALOR_NAO_FINITO, 0)
+
+            # Estouro do horizonte: (1 + i)^n além do maior float (a taxa inválida já tem o próprio código)
+            expoente = np.maximum(prazos_meses, 0) * np.log1p(np.maximum(taxas_juros, 0))
+            codigos |= np.where(expoente > LOG_MAIOR_FLOAT, ERRO_PRAZO_EXCESSIVO, 0)
+
+            if taxas_inflacao is not None:
+                taxas_inflacao = np.broadcast_to(np.asarray(taxas_inflacao, dtype=np.float64), capitais.shape)
+                codigos |= np.where(taxas_inflacao <= -1, ERRO_INFLACAO_INVALIDA, 0)
+                codigos |= np.where(~np.isfinite(taxas_inflacao), ERRO_VALOR_NAO_FINITO, 0)
+
+        return codigos
+
+
+    @staticmethod
+    def descrever_erros(codigo): # Função que converte um código de erro da validação do lote na lista de mensagens correspondentes
+        return [mensagem for bit, mensagem in MENSAGENS_ERRO_VALIDACAO.items() if int(codigo) & bit]
+
+
+    @staticmethod
+    def fator_anuidade(fator, meses): # Função auxiliar para o fator da Série Uniforme Antecipada ((1 + i) * ((1 + i)^n - 1) / i), com o caso de taxa zero tratado à parte
+        taxa = fator - 1
+        sem_juros = taxa == 0
+        taxa_segura = np.where(sem_juros, 1.0, taxa)
+        return np.where(sem_juros, meses, fator * (np.power(fator, meses) - 1) / taxa_segura)
+
+
+    @staticmethod
+    def _segmentos_lote(aportes, duracoes, prazos_meses): # Função auxiliar que converte os cronogramas em segmentos (início, meses efetivos, aporte) truncados ao prazo de cada cenário
+        quantidade = prazos_meses.shape[0]
+        limites = np.cumsum(duracoes, axis=1)
+        inicio = limites - duracoes
+        meses = np.clip(prazos_meses[:, None] - inicio, 0, duracoes)
+
+        # Segmento final sem aportes, do término dos períodos de aporte até o fim do prazo
+        inicio_final = np.minimum(limites[:, -1] if limites.shape[1] else 0, prazos_meses)
+        inicio = np.concatenate([inicio, np.broadcast_to(inicio_final, (quantidade,))[:, None]], axis=1)
+        meses = np.concatenate([meses, (prazos_meses - inicio_final)[:, None]], axis=1)
+        aportes = np.concatenate([aportes, np.zeros((quantidade, 1))], axis=1)
+
+        return inicio, meses, aportes
+
+
+    @staticmethod
+    def _evoluir_segmentos(capitais, fator, inicio, meses, aportes, horizonte, retornar_series): # Função auxiliar que aplica a forma fechada segmento a segmento e, se pedido, reconstrói as séries mensais em blocos de cenários
+        quantidade, num_segmentos = meses.shape
+        valores_inicio = np.empty((quantidade, num_segmentos))
+        valor = capitais.copy()
+
+        for p in range(num_segmentos): # Laço apenas sobre os segmentos (poucos); cada passo é vetorizado sobre todos os cenários
+            valores_inicio[:, p] = valor
+            valor = valor * np.power(fator, meses[:, p]) + aportes[:, p] * CalculosProjecaoLote.fator_anuidade(fator, meses[:, p])
+
+        if not retornar_series:
+            return valor, None
+
+        patrimonio_mensal = np.full((quantidade, horizonte), np.nan)
+        fim = inicio + meses
+        mes = np.arange(1, horizonte + 1)
+
+        for bloco in range(0, quantidade, TAMANHO_BLOCO_LOTE): # Blocos de cenários limitam a memória dos arrays temporários (bloco x meses)
+            linhas = slice(bloco, bloco + TAMANHO_BLOCO_LOTE)
+            indice = np.zeros((min(TAMANHO_BLOCO_LOTE, quantidade - bloco), horizonte), dtype=np.intp)
+            for p in range(num_segmentos - 1):
+                indice += mes[None, :] > fim[linhas, p][:, None]
+
+            decorrido = mes[None, :] - np.take_along_axis(inicio[linhas], indice, axis=1)
+            fator_bloco = fator[linhas][:, None]
+            serie = (np.take_along_axis(valores_inicio[linhas], indice, axis=1) * np.power(fator_bloco, decorrido)
+                     + np.take_along_axis(aportes[linhas], indice, axis=1) * CalculosProjecaoLote.fator_anuidade(fator_bloco, decorrido))
+
+            ativo = mes[None, :] <= fim[linhas, -1][:, None]
+            patrimonio_mensal[linhas] = np.where(ativo, serie, np.nan)
+
+        return valor, patrimonio_mensal
+
+
+    @staticmethod
+    def valor_futuro_ant_lote(capitais, taxas_juros, aportes, duracoes, prazos_meses, taxas_inflacao=None, retornar_series=True, ignorar_invalidos=False): # Função para o cálculo do VALOR FUTURO ANTECIPADO de um LOTE de cenários
+        # Com ignorar_invalidos=True os cenários inválidos não interrompem o lote: ficam com NaN e o código de erro de cada cenário é retornado em 'Códigos de Erro'
+        try:
+            if ignorar_invalidos:
+                return CalculosProjecaoLote._calcular_validos(capitais, taxas_juros, aportes, duracoes, prazos_meses, taxas_inflacao, retornar_series)
+
+            capitais, taxas_juros, aportes, duracoes, prazos_meses = CalculosProjecaoLote._preparar_entradas(capitais, taxas_juros, aportes, duracoes, prazos_meses)
+
+            if np.any(capitais < 0) or np.any(taxas_juros < 0) or np.any(prazos_meses < 0):
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if np.any(aportes < 0) or np.any(duracoes < 0):
+                raise ValueError("Aportes e durações devem ser não negativos")
+
+            horizonte = int(prazos_meses.max()) if capitais.shape[0] else 0
+            inicio, meses, aportes = CalculosProjecaoLote._segmentos_lote(aportes, duracoes, prazos_meses)
+
+            valor_final, patrimonio_mensal = CalculosProjecaoLote._evoluir_segmentos(
+                capitais, 1 + taxas_juros, inicio, meses, aportes, horizonte, retornar_series)
+
+            resultado = {
+                'Valor Futuro Final': valor_final,
+                'Patrimônio Mensal': patrimonio_mensal
+            }
+
+            if taxas_inflacao is not None: # Séries reais = nominais deflacionadas pelo índice de inflação acumulado, como em CalculosProjecao.projecao_completa
+                taxas_inflacao = np.broadcast_to(np.asarray(taxas_inflacao, dtype=np.float64), capitais.shape)
+                if np.any(taxas_inflacao <= -1):
+                    raise ValueError("Taxa de inflação inválida (causaria divisão por zero)")
+
+                fator_inflacao = 1 + taxas_inflacao
+                resultado['Valor Futuro Final Real'] = valor_final / np.power(fator_inflacao, prazos_meses)
+                resultado['Patrimônio Mensal Real'] = None
+                if retornar_series:
+                    resultado['Patrimônio Mensal Real'] = patrimonio_mensal / np.power(fator_inflacao[:, None], np.arange(1, horizonte + 1))
+
+            return resultado
+
+        except Exception as e:
+            print(f"Erro no cálculo do lote de projeções: {e}")
+            return None
+
+
+    @staticmethod
+    def para_centavos(valores): # Função para converter valores em reais para centavos inteiros (int64), arredondando ao centavo mais próximo
+        return np.rint(np.asarray(valores, dtype=np.float64) * 100).astype(np.int64)
+
+
+    @staticmethod
+    def _juros_centavos(saldo, taxa_inteira, regra_arredondamento): # Função auxiliar com os juros EXATOS do mês (saldo * taxa / ESCALA) em aritmética inteira, arredondados pela regra escolhida
+        # O saldo é dividido em (alto * ESCALA + baixo) para que os produtos intermediários caibam no int64: juros = alto * taxa + baixo * taxa / ESCALA
+        alto, baixo = np.divmod(saldo, ESCALA_TAXA_CENTAVOS)
+        quociente, resto = np.divmod(baixo * taxa_inteira, ESCALA_TAXA_CENTAVOS)
+        juros = alto * taxa_inteira + quociente
+
+        if regra_arredondamento == 'truncar':
+            return juros
+        dobro_resto = 2 * resto
+        if regra_arredondamento == 'meio_acima':
+            return juros + (dobro_resto >= ESCALA_TAXA_CENTAVOS)
+        return juros + ((dobro_resto > ESCALA_TAXA_CENTAVOS) | ((dobro_resto == ESCALA_TAXA_CENTAVOS) & (juros % 2 == 1)))
+
+
+    @staticmethod
+    def valor_futuro_ant_centavos_lote(capitais, taxas_juros, aportes, duracoes, prazos_meses, regra_arredondamento='meio_par', retornar_series=True): # Função para o cálculo EXATO (centavos int64) do VALOR FUTURO ANTECIPADO de um LOTE de cenários
+        # A cada mês: saldo += aporte; saldo += juros arredondados ao centavo. O laço é sobre os meses e cada passo é vetorizado sobre os cenários
+        try:
+            if regra_arredondamento not in REGRAS_ARREDONDAMENTO:
+                raise ValueError(f"Regra de arredondamento inválida (use uma de {', '.join(REGRAS_ARREDONDAMENTO)})")
+
+            capitais, taxas_juros, aportes, duracoes, prazos_meses = CalculosProjecaoLote._preparar_entradas(capitais, taxas_juros, aportes, duracoes, prazos_meses)
+
+            if np.any(capitais < 0) or np.any(taxas_juros < 0) or np.any(prazos_meses < 0):
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if np.any(aportes < 0) or np.any(duracoes < 0):
+                raise ValueError("Aportes e durações devem ser não negativos")
+            if np.any(taxas_juros > 1):
+                raise ValueError("A taxa de juros mensal do modo exato deve ser de no máximo 100%")
+
+            if np.any(capitais * 100 > LIMITE_SALDO_CENTAVOS) or np.any(aportes * 100 > LIMITE_SALDO_CENTAVOS): # Verificado em float, antes da conversão para int64
+                raise OverflowError("O capital inicial ou os aportes excedem o limite do modo exato em centavos")
+
+            quantidade = capitais.shape[0]
+            horizonte = int(prazos_meses.max()) if quantidade else 0
+
+            saldo = CalculosProjecaoLote.para_centavos(capitais)
+            taxa_inteira = np.rint(taxas_juros * ESCALA_TAXA_CENTAVOS).astype(np.int64)
+            inicio, meses, aportes = CalculosProjecaoLote._segmentos_lote(aportes, duracoes, prazos_meses)
+            aportes_centavos = CalculosProjecaoLote.para_centavos(aportes)
+            fim = inicio + meses
+
+            patrimonio_mensal = np.full((quantidade, horizonte), CENTAVOS_AUSENTE, dtype=np.int64) if retornar_series else None
+            total_aportes = np.zeros(quantidade, dtype=np.int64)
+
+            # O aporte vigente só muda no início de algum segmento: entre esses meses o vetor de aportes é reaproveitado
+            meses_mudanca = set(np.unique(inicio).tolist())
+            aporte_vigente = np.zeros(quantidade, dtype=np.int64)
+
+            for mes in range(horizonte):
+                if mes in meses_mudanca:
+                    segmento = np.minimum((fim <= mes).sum(axis=1), aportes_centavos.shape[1] - 1) # Segmento de aporte vigente no mês de cada cenário
+                    aporte_vigente = aportes_centavos[np.arange(quantidade), segmento]
+                ativo = mes < prazos_meses
+                aporte = np.where(ativo, aporte_vigente, 0)
+
+                # Cada parcela é comparada com a folga (LIMITE - saldo, sempre >= 0) antes da soma: o int64 nunca chega a estourar
+                if np.any(aporte > LIMITE_SALDO_CENTAVOS - saldo):
+                    raise OverflowError("O saldo excede o limite do modo exato em centavos")
+                saldo_com_aporte = saldo + aporte
+                juros = np.where(ativo, CalculosProjecaoLote._juros_centavos(saldo_com_aporte, taxa_inteira, regra_arredondamento), 0)
+                if np.any(juros > LIMITE_SALDO_CENTAVOS - saldo_com_aporte):
+                    raise OverflowError("O saldo excede o limite do modo exato em centavos")
+                saldo = saldo_com_aporte + juros
+                total_aportes += aporte
+                if retornar_series:
+                    patrimonio_mensal[ativo, mes] = saldo[ativo]
+
+            return {
+                'Valor Futuro Final': saldo,
+                'Patrimônio Mensal': patrimonio_mensal,
+                'Total Aportes': total_aportes,
+                'Taxa Inteira': taxa_inteira
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo do lote de projeções em centavos: {e}")
+            return None
+
+
+    @staticmethod
+    def _calcular_validos(capitais, taxas_juros, aportes, duracoes, prazos_meses, taxas_inflacao, retornar_series): # Função auxiliar que calcula apenas os cenários válidos do lote e preenche os inválidos com NaN
+        capitais, taxas_juros, aportes, duracoes, prazos_meses = CalculosProjecaoLote._preparar_entradas(capitais, taxas_juros, aportes, duracoes, prazos_meses)
+        codigos = CalculosProjecaoLote.validar_lote(capitais, taxas_juros, aportes, duracoes, prazos_meses, taxas_inflacao)
+        validos = codigos == 0
+        quantidade = capitais.shape[0]
+        horizonte = int(prazos_meses[validos].max()) if np.any(validos) else 0
+
+        inflacao_validos = None
+        if taxas_inflacao is not None:
+            inflacao_validos = np.broadcast_to(np.asarray(taxas_inflacao, dtype=np.float64), (quantidade,))[validos]
+
+        parcial = CalculosProjecaoLote.valor_futuro_ant_lote(capitais[validos], taxas_juros[validos], aportes[validos], duracoes[validos],
+                                                             prazos_meses[validos], inflacao_validos, retornar_series)
+
+        # Espalha os resultados dos cenários válidos nas posições originais do lote
+        resultado = {'Códigos de Erro': codigos}
+        for chave, valores in parcial.items():
+            if valores is None:
+                resultado[chave] = None
+                continue
+            completo = np.full((quantidade,) + valores.shape[1:], np.nan)
+            completo[validos] = valores
+            resultado[chave] = completo if valores.ndim == 1 else completo[:, :horizonte]
+        return resultado
+
+
+    @staticmethod
+    def iterar_lote(capitais, taxas_juros, aportes, duracoes, prazos_meses, taxas_inflacao=None, retornar_series=True, cenarios_por_bloco=TAMANHO_BLOCO_LOTE): # Função geradora que calcula um LOTE em blocos de cenários, produzindo (início, fim, resultado do bloco) para gravação ou agregação incremental
+        capitais, taxas_juros, aportes, duracoes, prazos_meses = CalculosProjecaoLote._preparar_entradas(capitais, taxas_juros, aportes, duracoes, prazos_meses)
+        quantidade = capitais.shape[0]
+        if taxas_inflacao is not None:
+            taxas_inflacao = np.broadcast_to(np.asarray(taxas_inflacao, dtype=np.float64), (quantidade,))
+
+        for inicio in range(0, quantidade, cenarios_por_bloco):
+            fim = min(inicio + cenarios_por_bloco, quantidade)
+            resultado = CalculosProjecaoLote.valor_futuro_ant_lote(
+                capitais[inicio:fim], taxas_juros[inicio:fim], aportes[inicio:fim], duracoes[inicio:fim], prazos_meses[inicio:fim],
+                None if taxas_inflacao is None else taxas_inflacao[inicio:fim], retornar_series)
+            if resultado is None: # O erro já foi informado por valor_futuro_ant_lote
+                return
+            yield inicio, fim, resultado
+
+
+    @staticmethod
+    def valor_futuro_sem_aportes_lote(capitais, taxas_juros, prazos_meses, retornar_series=True): # Função para o cálculo do VALOR FUTURO SEM APORTES de um LOTE de cenários (forma fechada com broadcasting)
+        try:
+            capitais = np.atleast_1d(np.asarray(capitais, dtype=np.float64))
+            quantidade = capitais.shape[0]
+            taxas_juros = np.broadcast_to(np.asarray(taxas_juros, dtype=np.float64), (quantidade,))
+            prazos_meses = np.broadcast_to(np.asarray(prazos_meses, dtype=np.int64), (quantidade,))
+
+            if np.any(capitais < 0) or np.any(taxas_juros < 0) or np.any(prazos_meses < 0):
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+
+            valor_final = capitais * np.power(1 + taxas_juros, prazos_meses)
+            patrimonio_mensal = None
+
+            if retornar_series:
+                horizonte = int(prazos_meses.max()) if quantidade else 0
+                meses = np.arange(1, horizonte + 1, dtype=np.float64)
+                patrimonio_mensal = capitais[:, None] * np.power(1 + taxas_juros[:, None], meses[None, :])
+                patrimonio_mensal[meses[None, :] > prazos_meses[:, None]] = np.nan # Meses além do prazo de cada cenário
+
+            return {
+                'Valor Futuro Final': valor_final,
+                'Patrimônio Mensal': patrimonio_mensal
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo do lote de projeções sem aportes: {e}")
+            return None
+
+
+    @staticmethod
+    def grade_sensibilidade(capital_inicial, taxas_juros, prazos_meses, aportes_mensais, taxa_inflacao=0.0): # Função para a ANÁLISE DE SENSIBILIDADE: valores finais em uma grade (taxa x prazo x aporte) calculada com broadcasting
+        # Cada eixo da grade é um vetor; o aporte mensal de cada nível é constante durante todo o prazo e as taxas são mensais
+        try:
+            taxas_juros = np.atleast_1d(np.asarray(taxas_juros, dtype=np.float64))
+            prazos_meses = np.atleast_1d(np.asarray(prazos_meses, dtype=np.int64))
+            aportes_mensais = np.atleast_1d(np.asarray(aportes_mensais, dtype=np.float64))
+
+            if capital_inicial < 0 or np.any(taxas_juros < 0) or np.any(prazos_meses < 0):
+                raise ValueError("O capital inicial, a taxa de juros ou o prazo não podem ser negativos")
+            if np.any(aportes_mensais < 0):
+                raise ValueError("Os aportes devem ser não negativos")
+            if taxa_inflacao <= -1:
+                raise ValueError("Taxa de inflação inválida (causaria divisão por zero)")
+
+            # Eixos da grade: taxa (linhas), prazo (colunas) e aporte (camadas)
+            fator = 1 + taxas_juros[:, None]
+            prazos = prazos_meses[None, :]
+            crescimento = np.power(fator, prazos)
+            anuidade = CalculosProjecaoLote.fator_anuidade(fator, prazos)
+
+            valor_final = (capital_inicial * crescimento)[:, :, None] + anuidade[:, :, None] * aportes_mensais[None, None, :]
+            valor_final_real = valor_final / np.power(1 + taxa_inflacao, prazos_meses)[None, :, None] # Deflacionado pelo índice de inflação acumulado
+
+            return {
+                'Taxas de Juros': taxas_juros,
+                'Prazos (Meses)': prazos_meses,
+                'Aportes Mensais': aportes_mensais,
+                'Valor Futuro Final': valor_final,
+                'Valor Futuro Final Real': valor_final_real
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo da grade de sensibilidade: {e}")
+            return None
+
+
+    @staticmethod
+    def tempo_usufruto_lote(patrimonios_iniciais, retiradas_mensais, taxas_juros_reais): # Função para o cálculo do TEMPO DE USUFRUTO de um LOTE de patrimônios / retiradas / taxas (tabelas de decaimento)
+        try:
+            patrimonios_iniciais, retiradas_mensais, taxas_juros_reais = np.broadcast_arrays(
+                np.asarray(patrimonios_iniciais, dtype=np.float64), np.asarray(retiradas_mensais, dtype=np.float64), np.asarray(taxas_juros_reais, dtype=np.float64))
+
+            if np.any(patrimonios_iniciais <= 0) or np.any(retiradas_mensais <= 0) or np.any(taxas_juros_reais < 0):
+                raise ValueError("Patrimônio inicial, retirada mensal ou taxa de juros não podem ser negativos")
+
+            meses = CalculosProjecao._meses_usufruto(patrimonios_iniciais, retiradas_mensais, taxas_juros_reais)
+            meses = np.where(meses > LIMITE_MESES_USUFRUTO, np.inf, meses)
+            finito = np.isfinite(meses)
+
+            return {
+                'Meses': meses,
+                'Anos': np.floor_divide(meses, 12, where=finito, out=np.full(meses.shape, np.nan)), # Meses infinitos resultam em NaN
+                'Meses Restantes': np.mod(meses, 12, where=finito, out=np.full(meses.shape, np.nan))
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo do lote de tempo de usufruto: {e}")
+            return None
+
+
+    @staticmethod
+    def prazo_para_valor_futuro_lote(capitais_iniciais, aportes_mensais, taxas_juros, valores_futuros_desejados): # Função para o cálculo do PRAZO NECESSÁRIO de um LOTE de metas (tabelas de "tempo até a meta")
+        try:
+            capitais_iniciais, aportes_mensais, taxas_juros, valores_futuros_desejados = np.broadcast_arrays(
+                np.asarray(capitais_iniciais, dtype=np.float64), np.asarray(aportes_mensais, dtype=np.float64),
+                np.asarray(taxas_juros, dtype=np.float64), np.asarray(valores_futuros_desejados, dtype=np.float64))
+
+            if np.any(capitais_iniciais < 0) or np.any(aportes_mensais < 0) or np.any(taxas_juros < 0) or np.any(valores_futuros_desejados <= 0):
+                raise ValueError("Capital inicial, aporte mensal, taxa de juros não podem ser negativos. O valor futuro desejado deve ser positivo.")
+
+            meses = CalculosProjecao._meses_para_valor_futuro(capitais_iniciais, aportes_mensais, taxas_juros, valores_futuros_desejados)
+            meses = np.where((taxas_juros > 0) & (meses > LIMITE_MESES_VALOR_FUTURO), np.inf, meses)
+
+            return {
+                'Meses': meses,
+                'Anos': meses / 12
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo do lote de prazos para o valor futuro: {e}")
+            return None
+
+
+    @staticmethod
+    def _colunas_amortizacao(sistema, valor_financiado, taxa, prazo_meses, mes): # Função auxiliar (vetorizada) com as colunas do cronograma em forma fechada para cada par (contrato, mês)
+        sem_juros = taxa == 0
+        taxa_segura = np.where(sem_juros, 1.0, taxa)
+        fator = 1 + taxa
+
+        if sistema == 'price':
+            crescimento_prazo = np.power(fator, prazo_meses)
+            parcela = np.where(sem_juros, valor_financiado / prazo_meses,
+                               valor_financiado * taxa_segura * crescimento_prazo / np.where(sem_juros, 1.0, crescimento_prazo - 1)) # Parcela Constante
+            crescimento_anterior = np.power(fator, mes - 1)
+            saldo_anterior = np.where(sem_juros, valor_financiado - parcela * (mes - 1),
+                                      valor_financiado * crescimento_anterior - parcela * (crescimento_anterior - 1) / taxa_segura)
+            juros = saldo_anterior * taxa
+            amortizacao = parcela - juros
+            parcela = np.broadcast_to(parcela, juros.shape)
+        else:
+            amortizacao = np.broadcast_to(valor_financiado / prazo_meses, np.broadcast(valor_financiado, mes).shape) # Amortização Constante
+            saldo_anterior = valor_financiado - amortizacao * (mes - 1)
+            juros = saldo_anterior * taxa
+            parcela = amortizacao + juros
+
+        saldo_devedor = np.maximum(saldo_anterior - amortizacao, 0)
+        return parcela, juros, amortizacao, saldo_devedor
+
+
+    @staticmethod
+    def tabela_amortizacao_lote(valores_totais, taxas, prazos_meses, entradas=0, sistema='price', formato='denso', retornar_tabela=True): # Cálculo das TABELAS PRICE ou SAC de uma CARTEIRA de contratos
+        try:
+            if sistema not in ('price', 'sac'):
+                raise ValueError("O sistema de amortização deve ser 'price' ou 'sac'")
+            if formato not in ('denso', 'csr'):
+                raise ValueError("O formato da tabela deve ser 'denso' ou 'csr'")
+
+            valores_totais, taxas, prazos_meses, entradas = np.broadcast_arrays(
+                np.atleast_1d(np.asarray(valores_totais, dtype=np.float64)), np.asarray(taxas, dtype=np.float64),
+                np.asarray(prazos_meses, dtype=np.int64), np.asarray(entradas, dtype=np.float64))
+
+            if np.any(valores_totais <= 0) or np.any(taxas < 0) or np.any(prazos_meses <= 0) or np.any(entradas < 0) or np.any(entradas >= valores_totais):
+                raise ValueError("Verifique os valores inputados")
+
+            taxas = taxas / 100 # Transforma a taxa em %
+            valor_financiado = valores_totais - entradas
+
+            # Totais em forma fechada (sem materializar o cronograma)
+            if sistema == 'price':
+                crescimento_prazo = np.power(1 + taxas, prazos_meses)
+                sem_juros = taxas == 0
+                parcela = np.where(sem_juros, valor_financiado / prazos_meses,
+                                   valor_financiado * taxas * crescimento_prazo / np.where(sem_juros, 1.0, crescimento_prazo - 1))
+                total_pagamentos = parcela * prazos_meses
+                total_juros = total_pagamentos - valor_financiado
+            else:
+                total_juros = taxas * valor_financiado * (prazos_meses + 1) / 2 # Juros sobre saldos que decrescem linearmente
+                total_pagamentos = valor_financiado + total_juros
+
+            resultado = {
+                'Valor Financiado': valor_financiado,
+                'Tabela de Pagamentos': None,
+                'Total em Juros': total_juros,
+                'Total em Pagamentos': total_pagamentos,
+                'Entrada': entradas
+            }
+
+            if not retornar_tabela:
+                return resultado
+
+            quantidade = valor_financiado.shape[0]
+            colunas = ('Parcela', 'Juros', 'Amortização', 'Saldo Devedor')
+
+            if formato == 'denso': # Matrizes (contrato x mês) preenchidas com NaN após o prazo de cada contrato
+                horizonte = int(prazos_meses.max())
+                tabela = {coluna: np.full((quantidade, horizonte), np.nan) for coluna in colunas}
+                mes = np.arange(1, horizonte + 1)
+
+                for bloco in range(0, quantidade, TAMANHO_BLOCO_LOTE): # Blocos de contratos limitam a memória dos arrays temporários
+                    linhas = slice(bloco, bloco + TAMANHO_BLOCO_LOTE)
+                    valores = CalculosProjecaoLote._colunas_amortizacao(
+                        sistema, valor_financiado[linhas, None], taxas[linhas, None], prazos_meses[linhas, None], mes[None, :])
+                    ativo = mes[None, :] <= prazos_meses[linhas, None]
+                    for coluna, valor in zip(colunas, valores):
+                        tabela[coluna][linhas] = np.where(ativo, valor, np.nan)
+
+            else: # Layout CSR: colunas contíguas com os meses de todos os contratos e ponteiros para o início de cada contrato (sem preenchimento para prazos mistos)
+                ponteiros = np.concatenate(([0], np.cumsum(prazos_meses)))
+                total_linhas = int(ponteiros[-1])
+                tabela = {'Ponteiros': ponteiros, 'Mês': np.empty(total_linhas, dtype=np.int64)}
+                tabela.update({coluna: np.empty(total_linhas) for coluna in colunas})
+
+                for bloco in range(0, quantidade, TAMANHO_BLOCO_LOTE):
+                    contratos = np.arange(bloco, min(bloco + TAMANHO_BLOCO_LOTE, quantidade))
+                    inicio, fim = int(ponteiros[contratos[0]]), int(ponteiros[contratos[-1] + 1])
+                    contrato = np.repeat(contratos, prazos_meses[contratos])
+                    mes = np.arange(inicio, fim) - ponteiros[contrato] + 1
+
+                    valores = CalculosProjecaoLote._colunas_amortizacao(
+                        sistema, valor_financiado[contrato], taxas[contrato], prazos_meses[contrato], mes)
+                    tabela['Mês'][inicio:fim] = mes
+                    for coluna, valor in zip(colunas, valores):
+                        tabela[coluna][inicio:fim] = valor
+
+            resultado['Tabela de Pagamentos'] = tabela
+            return resultado
+
+        except Exception as e:
+            print(f"Erro no cálculo do lote de tabelas de amortização: {e}")
+            return None
@@ -0,0 +1,186 @@
+# Importação das Bibliotecas Necessárias
+
+import numpy as np
+import pandas as pd
+
+from models import CalculosProjecao # Importação da classe com as funções que fazem os cálculos financeiros e de projeção
+
+
+
+# Percentis das bandas de patrimônio retornadas pelas simulações
+PERCENTIS_SIMULACAO = (5, 50, 95)
+
+# Quantidade de meses simulados por bloco: a memória usada é proporcional a (caminhos x meses do bloco), e não ao horizonte inteiro
+MESES_POR_BLOCO_SIMULACAO = 12
+
+
+
+class SimulacaoMonteCarlo: # Classe com a projeção ESTOCÁSTICA (Monte Carlo) do patrimônio, com retornos e inflação mensais aleatórios
+
+    @staticmethod
+    def _selecionar_ordens(valores, ordens, deslocamento=0): # Função auxiliar que posiciona (np.partition, no próprio array) as estatísticas de ordem pedidas em cada linha
+        if not ordens:
+            return
+        meio = len(ordens) // 2
+        k = ordens[meio] - deslocamento
+        valores.partition(k, axis=1)
+
+        # As ordens menores ficam à esquerda de k e as maiores à direita: cada lado é particionado apenas na sua metade
+        SimulacaoMonteCarlo._selecionar_ordens(valores[:, :k], ordens[:meio], deslocamento)
+        SimulacaoMonteCarlo._selecionar_ordens(valores[:, k + 1:], ordens[meio + 1:], deslocamento + k + 1)
+
+
+    @staticmethod
+    def percentis_por_linha(valores): # Função que calcula os PERCENTIS_SIMULACAO de cada linha (posto mais próximo), reordenando 'valores' no próprio array
+        quantidade = valores.shape[1]
+        ordens = [int(round(p / 100 * (quantidade - 1))) for p in PERCENTIS_SIMULACAO]
+        SimulacaoMonteCarlo._selecionar_ordens(valores, ordens)
+        return valores[:, ordens].T
+
+
+    @staticmethod
+    def projetar(capital_inicial, aportes, num_caminhos, gerar_fatores, valor_desejado=None): # Função genérica que evolui os caminhos em blocos de meses e acumula os percentis de cada mês
+        prazo_meses = len(aportes)
+        bandas_nominal = np.empty((len(PERCENTIS_SIMULACAO), prazo_meses))
+        bandas_real = np.empty((len(PERCENTIS_SIMULACAO), prazo_meses))
+
+        patrimonio = np.full(num_caminhos, float(capital_inicial)) # Estado de cada caminho ao final do bloco anterior
+        indice_inflacao = np.ones(num_caminhos) # Índice de inflação acumulado de cada caminho (deflator da série real)
+
+        for inicio in range(0, prazo_meses, MESES_POR_BLOCO_SIMULACAO):
+            fim = min(inicio + MESES_POR_BLOCO_SIMULACAO, prazo_meses)
+
+            # Matrizes (meses do bloco x caminhos) com (1 + retorno) e (1 + inflação); cada mês é uma linha contígua com todos os caminhos
+            fatores_juros, fatores_inflacao = gerar_fatores(inicio, fim)
+
+            # Dentro do bloco: V_t = G_t * (V_0 + soma_{s <= t} A_s / G_{s-1}), com G_t o produto acumulado dos fatores desde o início do bloco
+            crescimento = np.cumprod(fatores_juros, axis=0)
+            crescimento_anterior = np.concatenate([np.ones((1, num_caminhos)), crescimento[:-1]], axis=0)
+            bloco_nominal = crescimento * (patrimonio + np.cumsum(aportes[inicio:fim, None] / crescimento_anterior, axis=0))
+
+            bloco_indice = indice_inflacao * np.cumprod(fatores_inflacao, axis=0)
+            bloco_real = bloco_nominal / bloco_indice # Série real obtida deflacionando pelo índice de inflação acumulado
+
+            patrimonio = bloco_nominal[-1].copy()
+            indice_inflacao = bloco_indice[-1].copy()
+
+            bandas_nominal[:, inicio:fim] = SimulacaoMonteCarlo.percentis_por_linha(bloco_nominal)
+            bandas_real[:, inicio:fim] = SimulacaoMonteCarlo.percentis_por_linha(bloco_real)
+
+        patrimonio_real = patrimonio / indice_inflacao
+        probabilidade_meta = float(np.mean(patrimonio >= valor_desejado)) if valor_desejado is not None else None
+        probabilidade_meta_real = float(np.mean(patrimonio_real >= valor_desejado)) if valor_desejado is not None else None
+
+        return {
+            'Meses': np.arange(1, prazo_meses + 1),
+            'Percentis': PERCENTIS_SIMULACAO,
+            'Patrimônio Nominal': bandas_nominal,
+            'Patrimônio Real': bandas_real,
+            'Valor Final Nominal': bandas_nominal[:, -1].copy(),
+            'Valor Final Real': bandas_real[:, -1].copy(),
+            'Probabilidade Meta': probabilidade_meta,
+            'Probabilidade Meta Real': probabilidade_meta_real
+        }
+
+
+    @staticmethod
+    def simular(capital_inicial, taxa_juros, volatilidade_juros, taxa_inflacao, volatilidade_inflacao, aportes_por_periodo, prazo_meses,
+                num_caminhos=10000, valor_desejado=None, semente=None): # Função para a SIMULAÇÃO de MONTE CARLO com retornos e inflação mensais lognormais
+        try:
+            if capital_inicial < 0 or taxa_juros <= -1 or prazo_meses <= 0 or num_caminhos <= 0:
+                raise ValueError("O capital inicial não pode ser negativo e o prazo e o número de caminhos devem ser positivos")
+            if volatilidade_juros < 0 or volatilidade_inflacao < 0:
+                raise ValueError("As volatilidades não podem ser negativas")
+            if taxa_inflacao <= -1:
+                raise ValueError("Taxa de inflação inválida (causaria divisão por zero)")
+            for aporte, duracao in aportes_por_periodo:
+                if aporte < 0 or duracao < 0:
+                    raise ValueError("Aportes e durações devem ser não negativos")
+
+            gerador = np.random.default_rng(semente) # Mesma semente e mesmos parâmetros reproduzem a simulação
+
+            # Média do log-retorno ajustada para que o fator esperado E[1 + r] seja igual a (1 + taxa)
+            media_juros = np.log1p(taxa_juros) - volatilidade_juros ** 2 / 2
+            media_inflacao = np.log1p(taxa_inflacao) - volatilidade_inflacao ** 2 / 2
+
+            def gerar_fatores(inicio, fim):
+                formato = (fim - inicio, num_caminhos)
+                return (np.exp(gerador.normal(media_juros, volatilidade_juros, formato)),
+                        np.exp(gerador.normal(media_inflacao, volatilidade_inflacao, formato)))
+
+            aportes = CalculosProjecao.aportes_mensais(aportes_por_periodo, int(prazo_meses))
+            return SimulacaoMonteCarlo.projetar(capital_inicial, aportes, int(num_caminhos), gerar_fatores, valor_desejado)
+
+        except Exception as e:
+            print(f"Erro na simulação de Monte Carlo: {e}")
+            return None
+
+
+
+
+class SimulacaoBootstrap: # Classe com a simulação por BOOTSTRAP EM BLOCOS de séries históricas mensais de juros (ex.: CDI) e inflação (ex.: IPCA)
+
+    @staticmethod
+    def carregar_series(caminho_csv, coluna_juros='CDI', coluna_inflacao='IPCA', separador=';', decimal=','): # Função para ler do arquivo CSV local as taxas mensais históricas (em %) e convertê-las para decimais
+        try:
+            dados = pd.read_csv(caminho_csv, sep=separador, decimal=decimal)
+            for coluna in (coluna_juros, coluna_inflacao):
+                if coluna not in dados.columns:
+                    raise ValueError(f"A coluna '{coluna}' não foi encontrada no arquivo {caminho_csv}")
+
+            dados = dados[[coluna_juros, coluna_inflacao]].dropna()
+            taxas_juros = dados[coluna_juros].to_numpy(dtype=np.float64) / 100 # Transforma a taxa em %
+            taxas_inflacao = dados[coluna_inflacao].to_numpy(dtype=np.float64) / 100
+
+            if len(taxas_juros) == 0:
+                raise ValueError("O arquivo não contém meses válidos")
+            if np.any(taxas_juros <= -1) or np.any(taxas_inflacao <= -1):
+                raise ValueError("As taxas históricas devem ser maiores que -100%")
+
+            return taxas_juros, taxas_inflacao
+
+        except Exception as e:
+            print(f"Erro ao carregar as séries históricas: {e}")
+            return None, None
+
+
+    @staticmethod
+    def simular(capital_inicial, aportes_por_periodo, prazo_meses, taxas_juros_historicas, taxas_inflacao_historicas, tamanho_bloco=12,
+                num_caminhos=10000, valor_desejado=None, semente=None): # Função para a SIMULAÇÃO por BOOTSTRAP EM BLOCOS (circular) a partir das séries históricas
+        try:
+            taxas_juros_historicas = np.asarray(taxas_juros_historicas, dtype=np.float64)
+            taxas_inflacao_historicas = np.asarray(taxas_inflacao_historicas, dtype=np.float64)
+
+            if capital_inicial < 0 or prazo_meses <= 0 or num_caminhos <= 0 or tamanho_bloco <= 0:
+                raise ValueError("O capital inicial não pode ser negativo e o prazo, o número de caminhos e o tamanho do bloco devem ser positivos")
+            if taxas_juros_historicas.shape != taxas_inflacao_historicas.shape or taxas_juros_historicas.size == 0:
+                raise ValueError("As séries históricas de juros e inflação devem ter o mesmo número de meses")
+            for aporte, duracao in aportes_por_periodo:
+                if aporte < 0 or duracao < 0:
+                    raise ValueError("Aportes e durações devem ser não negativos")
+
+            prazo_meses = int(prazo_meses)
+            num_caminhos = int(num_caminhos)
+            meses_historicos = taxas_juros_historicas.size
+            gerador = np.random.default_rng(semente)
+
+            # Tabelas de fatores (1 + taxa) pré-calculadas e estendidas circularmente, para que qualquer bloco seja uma leitura contígua sem tratamento de borda
+            extensao = np.arange(meses_historicos + tamanho_bloco - 1) % meses_historicos
+            tabela_juros = (1 + taxas_juros_historicas)[extensao]
+            tabela_inflacao = (1 + taxas_inflacao_historicas)[extensao]
+
+            # Mês histórico inicial de cada bloco de cada caminho; juros e inflação usam os mesmos índices (preserva a correlação entre as séries)
+            num_blocos = -(-prazo_meses // tamanho_bloco)
+            inicios_blocos = gerador.integers(0, meses_historicos, size=(num_blocos, num_caminhos), dtype=np.int32)
+
+            def gerar_fatores(inicio, fim):
+                meses = np.arange(inicio, fim)
+                indices = inicios_blocos[meses // tamanho_bloco] + (meses % tamanho_bloco)[:, None] # Gather (meses do bloco x caminhos)
+                return tabela_juros[indices], tabela_inflacao[indices]
+
+            aportes = CalculosProjecao.aportes_mensais(aportes_por_periodo, prazo_meses)
+            return SimulacaoMonteCarlo.projetar(capital_inicial, aportes, num_caminhos, gerar_fatores, valor_desejado)
+
+        except Exception as e:
+            print(f"Erro na simulação por bootstrap histórico: {e}")
+            return None
@@ -0,0 +1,206 @@
+# Importação das Bibliotecas Necessárias
+
+import numpy as np
+
+from models import CalculosProjecaoLote # Importação da classe com os cálculos de projeção vetorizados sobre vários cenários
+
+
+
+# Tolerância relativa sobre o valor futuro desejado para considerar que o solucionador convergiu
+TOLERANCIA_SOLUCIONADOR = 1e-10
+
+# Número máximo de iterações (Newton com salvaguarda de bissecção) na busca da taxa
+MAX_ITERACOES_SOLUCIONADOR = 100
+
+# Limite superior do intervalo de busca da taxa (taxa ANUAL de 1000%)
+TAXA_ANUAL_MAXIMA_SOLUCIONADOR = 10.0
+
+
+
+class SolucionadorMetas: # Classe com as funções que encontram o APORTE, o CAPITAL INICIAL ou a TAXA necessários para atingir um VALOR FUTURO, vetorizadas sobre vários cenários
+
+    @staticmethod
+    def _preparar_metas(valores_desejados, capitais, taxas_juros, aportes, duracoes, prazos_meses): # Função auxiliar que converte os inputs em arrays (um cenário por linha) e os segmentos de aporte truncados ao prazo
+        valores_desejados = np.atleast_1d(np.asarray(valores_desejados, dtype=np.float64))
+        quantidade = valores_desejados.shape[0]
+        capitais = np.broadcast_to(np.asarray(capitais, dtype=np.float64), (quantidade,))
+
+        # Os cronogramas podem ser um só (aplicado a todos os cenários) ou um por cenário
+        aportes = np.asarray(aportes, dtype=np.float64)
+        duracoes = np.asarray(duracoes, dtype=np.int64)
+        if aportes.ndim == 1:
+            aportes = np.broadcast_to(aportes, (quantidade, aportes.shape[0]))
+        if duracoes.ndim == 1:
+            duracoes = np.broadcast_to(duracoes, (quantidade, duracoes.shape[0]))
+
+        capitais, taxas_juros, aportes, duracoes, prazos_meses = CalculosProjecaoLote._preparar_entradas(capitais, taxas_juros, aportes, duracoes, prazos_meses)
+
+        if np.any(valores_desejados <= 0):
+            raise ValueError("O valor futuro desejado deve ser positivo")
+        if np.any(capitais < 0) or np.any(prazos_meses < 0):
+            raise ValueError("O capital inicial ou o prazo não podem ser negativos")
+        if np.any(aportes < 0) or np.any(duracoes < 0):
+            raise ValueError("Aportes e durações devem ser não negativos")
+
+        inicio, meses, aportes = CalculosProjecaoLote._segmentos_lote(aportes, duracoes, prazos_meses)
+        return valores_desejados, capitais, taxas_juros, inicio, meses, aportes, prazos_meses
+
+
+    @staticmethod
+    def _valor_futuro(capitais, fator, meses, aportes): # Função auxiliar com o valor futuro final (forma fechada por segmento) de cada cenário
+        valor, _ = CalculosProjecaoLote._evoluir_segmentos(capitais, fator, None, meses, aportes, 0, False)
+        return valor
+
+
+    @staticmethod
+    def _valor_futuro_e_derivada(capitais, fator, meses, aportes): # Função auxiliar com o valor futuro final e sua derivada em relação ao fator (1 + i), segmento a segmento
+        valor = capitais.copy()
+        derivada = np.zeros_like(valor)
+        taxa = fator - 1
+        quase_sem_juros = np.abs(taxa) < 1e-8
+        taxa_segura = np.where(quase_sem_juros, 1.0, taxa)
+
+        for p in range(meses.shape[1]):
+            m = meses[:, p]
+            crescimento = np.power(fator, m)
+            anuidade = CalculosProjecaoLote.fator_anuidade(fator, m)
+
+            # d/df de f + f^2 + ... + f^m, com o limite m (m + 1) / 2 quando a taxa tende a zero
+            derivada_anuidade = np.where(quase_sem_juros, m * (m + 1) / 2,
+                                         (((m + 1) * crescimento - 1) * taxa_segura - (crescimento * fator - fator)) / taxa_segura ** 2)
+
+            derivada = derivada * crescimento + valor * m * np.power(fator, m - 1) + aportes[:, p] * derivada_anuidade
+            valor = valor * crescimento + aportes[:, p] * anuidade
+
+        return valor, derivada
+
+
+    @staticmethod
+    def aporte_necessario(valores_desejados, capitais, taxas_juros, duracoes, prazos_meses, pesos_aportes=None): # Função que calcula o APORTE MENSAL necessário para atingir o valor futuro, com cronogramas de vários períodos
+        # O cronograma é dado pelas durações dos períodos e pelos pesos relativos de cada período (padrão 1: mesmo aporte em todos); o resultado é o aporte do período de peso 1
+        # O valor futuro é linear no aporte, então a solução é exata (forma fechada, sem iterações)
+        try:
+            if pesos_aportes is None:
+                pesos_aportes = np.ones(np.shape(duracoes)[-1] if np.ndim(duracoes) else 0)
+            valores_desejados, capitais, taxas_juros, inicio, meses, pesos, prazos_meses = SolucionadorMetas._preparar_metas(
+                valores_desejados, capitais, taxas_juros, pesos_aportes, duracoes, prazos_meses)
+            if np.any(taxas_juros < 0):
+                raise ValueError("A taxa de juros não pode ser negativa")
+
+            fator = 1 + taxas_juros
+            valor_capital = capitais * np.power(fator, prazos_meses)
+            valor_por_aporte = SolucionadorMetas._valor_futuro(np.zeros_like(capitais), fator, meses, pesos)
+
+            # Sem aportes no prazo, a meta só é atingida se o capital inicial bastar
+            viavel = valor_por_aporte > 0
+            aporte = np.where(viavel, (valores_desejados - valor_capital) / np.where(viavel, valor_por_aporte, 1.0), np.nan)
+            aporte = np.where(valor_capital >= valores_desejados, 0.0, aporte) # Meta já atingida apenas com o capital inicial
+
+            obtido = valor_capital + np.nan_to_num(aporte) * valor_por_aporte
+            erro_relativo = np.abs(obtido - valores_desejados) / valores_desejados
+            convergiu = np.isfinite(aporte) & ((erro_relativo <= TOLERANCIA_SOLUCIONADOR) | (aporte == 0))
+
+            return {
+                'Aporte Necessário': aporte,
+                'Aportes por Período': aporte[:, None] * pesos[:, :-1], # Sem a coluna do segmento final sem aportes
+                'Convergiu': convergiu,
+                'Iterações': np.zeros(aporte.shape, dtype=np.int64),
+                'Erro Relativo': erro_relativo
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo do aporte necessário: {e}")
+            return None
+
+
+    @staticmethod
+    def capital_necessario(valores_desejados, taxas_juros, aportes, duracoes, prazos_meses): # Função que calcula o CAPITAL INICIAL necessário para atingir o valor futuro com um cronograma de aportes
+        # O valor futuro também é linear no capital inicial, então a solução é exata (forma fechada, sem iterações)
+        try:
+            valores_desejados, capitais, taxas_juros, inicio, meses, aportes, prazos_meses = SolucionadorMetas._preparar_metas(
+                valores_desejados, 0.0, taxas_juros, aportes, duracoes, prazos_meses)
+            if np.any(taxas_juros < 0):
+                raise ValueError("A taxa de juros não pode ser negativa")
+
+            fator = 1 + taxas_juros
+            valor_aportes = SolucionadorMetas._valor_futuro(capitais, fator, meses, aportes)
+            crescimento = np.power(fator, prazos_meses)
+
+            capital = np.maximum((valores_desejados - valor_aportes) / crescimento, 0.0) # Capital zero quando os aportes sozinhos já atingem a meta
+            obtido = capital * crescimento + valor_aportes
+            erro_relativo = np.abs(obtido - valores_desejados) / valores_desejados
+            convergiu = (erro_relativo <= TOLERANCIA_SOLUCIONADOR) | (capital == 0)
+
+            return {
+                'Capital Necessário': capital,
+                'Convergiu': convergiu,
+                'Iterações': np.zeros(capital.shape, dtype=np.int64),
+                'Erro Relativo': erro_relativo
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo do capital necessário: {e}")
+            return None
+
+
+    @staticmethod
+    def taxa_necessaria(valores_desejados, capitais, aportes, duracoes, prazos_meses, tolerancia=TOLERANCIA_SOLUCIONADOR, max_iteracoes=MAX_ITERACOES_SOLUCIONADOR): # Função que encontra a TAXA necessária para atingir o valor futuro (Newton com intervalo e bissecção, vetorizado sobre os cenários)
+        try:
+            valores_desejados, capitais, _, inicio, meses, aportes, prazos_meses = SolucionadorMetas._preparar_metas(
+                valores_desejados, capitais, 0.0, aportes, duracoes, prazos_meses)
+            quantidade = valores_desejados.shape[0]
+
+            # Intervalo de busca do fator mensal (1 + i): de taxa zero até a taxa anual máxima
+            inferior = np.ones(quantidade)
+            superior = np.full(quantidade, (1 + TAXA_ANUAL_MAXIMA_SOLUCIONADOR) ** (1 / 12))
+
+            valor_inferior = SolucionadorMetas._valor_futuro(capitais, inferior, meses, aportes)
+            valor_superior = SolucionadorMetas._valor_futuro(capitais, superior, meses, aportes)
+
+            # Sem solução no intervalo: meta abaixo do valor a taxa zero (exigiria taxa negativa) ou acima do valor a taxa máxima
+            viavel = (valor_inferior <= valores_desejados) & (valor_superior >= valores_desejados)
+            fator = np.where(viavel, 1 + (superior - 1) / 2, np.nan)
+            fator = np.where(viavel & (np.abs(valor_inferior - valores_desejados) <= tolerancia * valores_desejados), 1.0, fator)
+
+            convergiu = viavel & (fator == 1.0)
+            iteracoes = np.zeros(quantidade, dtype=np.int64)
+            erro_relativo = np.where(convergiu, np.abs(valor_inferior - valores_desejados) / valores_desejados, np.nan)
+
+            for _ in range(max_iteracoes):
+                ativos = np.flatnonzero(viavel & ~convergiu)
+                if not len(ativos):
+                    break
+
+                f = fator[ativos]
+                valor, derivada = SolucionadorMetas._valor_futuro_e_derivada(capitais[ativos], f, meses[ativos], aportes[ativos])
+                residuo = valor - valores_desejados[ativos]
+                iteracoes[ativos] += 1
+
+                # O valor futuro cresce com a taxa: o resíduo indica de que lado da raiz o ponto atual está
+                inf_a = np.where(residuo < 0, f, inferior[ativos])
+                sup_a = np.where(residuo > 0, f, superior[ativos])
+                inferior[ativos], superior[ativos] = inf_a, sup_a
+
+                erro = np.abs(residuo) / valores_desejados[ativos]
+                resolvido = (erro <= tolerancia) | (sup_a - inf_a <= tolerancia * sup_a)
+                erro_relativo[ativos] = erro
+                convergiu[ativos] = resolvido
+
+                # Passo de Newton sobre log(valor futuro), quase linear na taxa mesmo em prazos longos; quando ele sai do intervalo (ou a derivada não é útil), usa o ponto médio (bissecção)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    newton = f - (np.log(valor) - np.log(valores_desejados[ativos])) * valor / derivada
+                dentro = np.isfinite(newton) & (newton > inf_a) & (newton < sup_a)
+                fator[ativos] = np.where(resolvido, f, np.where(dentro, newton, (inf_a + sup_a) / 2))
+
+            taxa_mensal = fator - 1
+            return {
+                'Taxa Mensal Necessária': taxa_mensal,
+                'Taxa Anual Necessária': np.power(fator, 12) - 1,
+                'Convergiu': convergiu,
+                'Iterações': iteracoes,
+                'Erro Relativo': erro_relativo
+            }
+
+        except Exception as e:
+            print(f"Erro no cálculo da taxa necessária: {e}")
+            return None
@@ -0,0 +1,57 @@
+# Importação das Bibliotecas Necessárias
+
+import numpy as np
+
+from models import CalculosProjecao, TOLERANCIA_RELATIVA # Importação da classe com as funções de projeção e da tolerância documentada entre as versões vetorizada e de referência
+
+
+
+# Quantidade de cenários aleatórios conferidos
+QUANTIDADE_CENARIOS_VERIFICACAO = 300
+
+# Semente do gerador aleatório (cenários reprodutíveis)
+SEMENTE_VERIFICACAO = 2024
+
+
+
+def gerar_cenario(gerador): # Função que sorteia um cenário: capital, taxa mensal, cronograma de períodos (aporte, duração) e prazo de até 100 anos
+    capital_inicial = float(gerador.uniform(0, 1e6))
+    taxa_juros = float(gerador.uniform(0, 0.02))
+    quantidade_periodos = int(gerador.integers(0, 6))
+    aportes_por_periodo = [(float(gerador.uniform(0, 1e4)), int(gerador.integers(0, 240))) for _ in range(quantidade_periodos)]
+    prazo_meses = int(gerador.integers(0, 1201))
+    return capital_inicial, taxa_juros, aportes_por_periodo, prazo_meses
+
+
+def verificar_valor_futuro_ant(): # Função que compara valor_futuro_ant (forma fechada) com valor_futuro_ant_referencia (laço mês a mês) e falha se a diferença exceder TOLERANCIA_RELATIVA
+    gerador = np.random.default_rng(SEMENTE_VERIFICACAO)
+    maior_diferenca = 0.0
+    falhas = []
+
+    for cenario in range(QUANTIDADE_CENARIOS_VERIFICACAO):
+        entradas = gerar_cenario(gerador)
+        valor_final, patrimonio_mensal = CalculosProjecao.valor_futuro_ant(*entradas)
+        valor_final_referencia, patrimonio_referencia = CalculosProjecao.valor_futuro_ant_referencia(*entradas)
+
+        patrimonio_referencia = np.asarray(patrimonio_referencia, dtype=np.float64)
+        if valor_final is None or len(patrimonio_mensal) != len(patrimonio_referencia):
+            falhas.append(cenario)
+            continue
+
+        # Diferença relativa em todos os meses e no valor final (denominador mínimo de 1 para saldos nulos)
+        obtido = np.append(patrimonio_mensal, valor_final)
+        esperado = np.append(patrimonio_referencia, valor_final_referencia)
+        diferenca = float(np.max(np.abs(obtido - esperado) / np.maximum(np.abs(esperado), 1.0)))
+        maior_diferenca = max(maior_diferenca, diferenca)
+        if diferenca > TOLERANCIA_RELATIVA:
+            falhas.append(cenario)
+
+    print(f"valor_futuro_ant x referência: {QUANTIDADE_CENARIOS_VERIFICACAO} cenários, maior diferença relativa {maior_diferenca:.2e} (tolerância {TOLERANCIA_RELATIVA:.0e})")
+    return falhas
+
+
+
+if __name__ == "__main__":
+    falhas = verificar_valor_futuro_ant()
+    if falhas:
+        raise SystemExit(f"Cenários fora da tolerância: {falhas}")